@@ -0,0 +1,3 @@
+from . import purchase_request_export
+from . import purchase_request_load
+from . import purchase_request_benchmark
@@ -0,0 +1,215 @@
+import argparse
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import sys
+import time
+
+from odoo import api, fields, SUPERUSER_ID
+from odoo.cli import Command
+from odoo.modules.registry import Registry
+from odoo.tools import config
+
+_logger = logging.getLogger(__name__)
+
+
+class PurchaseRequestBenchmark(Command):
+    """ Seed a database and benchmark the request -> RFQ -> purchase order / sale order flow """
+    name = 'purchase_request_benchmark'
+
+    def run(self, cmdargs):
+        parser = argparse.ArgumentParser(prog='odoo-bin purchase_request_benchmark', description=self.__doc__.strip())
+        parser.add_argument('-c', '--config', help="Odoo configuration file")
+        parser.add_argument('-d', '--database', required=True, help="Database to run against")
+        parser.add_argument('--products', type=int, default=200)
+        parser.add_argument('--vendors', type=int, default=20)
+        parser.add_argument('--customers', type=int, default=20)
+        parser.add_argument('--sellers-per-product', type=int, default=3, help="Vendor pricelist lines per product")
+        parser.add_argument('--requests', type=int, default=50)
+        parser.add_argument('--lines', type=int, default=20, help="Lines per request")
+        parser.add_argument('--vendors-per-request', type=int, default=3, help="RFQs created for each request")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('-o', '--output', help="Write the JSON results to this file instead of stdout")
+        parser.add_argument('--profile-dir', help="Dump the cProfile statistics of every stage in this directory")
+        parser.add_argument('--baseline', help="JSON results of a previous run to compare with")
+        parser.add_argument('--tolerance', type=float, default=10.0,
+                            help="Allowed slowdown against the baseline, in percent")
+        parser.add_argument('--commit', action='store_true',
+                            help="Commit the generated records instead of rolling them back")
+        args = parser.parse_args(cmdargs)
+
+        config.parse_config(['-c', args.config] if args.config else [])
+        if args.profile_dir:
+            os.makedirs(args.profile_dir, exist_ok=True)
+
+        registry = Registry(args.database)
+        with registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {'tracking_disable': True})
+            results = Benchmark(env, args).run()
+            if not args.commit:
+                cr.rollback()
+
+        output = json.dumps(results, indent=2)
+        if args.output:
+            with open(args.output, 'w') as fp:
+                fp.write(output)
+        else:
+            print(output)
+
+        if args.baseline:
+            with open(args.baseline) as fp:
+                baseline = json.load(fp)
+            regressions = compare(baseline, results, args.tolerance)
+            for regression in regressions:
+                _logger.warning("Regression: %s", regression)
+            if regressions:
+                sys.exit(1)
+
+
+def compare(baseline, results, tolerance):
+    """ Return the stages whose duration or query count exceed the baseline by more than
+    ``tolerance`` percent. """
+    regressions = []
+    for stage, current in results['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous:
+            continue
+        for key in ('duration', 'queries'):
+            if previous[key] and current[key] > previous[key] * (1 + tolerance / 100.0):
+                regressions.append("%s %s: %s -> %s (%+.1f%%)" % (
+                    stage, key, previous[key], current[key], (current[key] / previous[key] - 1) * 100))
+    return regressions
+
+
+class Benchmark:
+
+    def __init__(self, env, args):
+        self.env = env
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.stages = {}
+
+    def measure(self, stage, func, count):
+        """ Run ``func`` under cProfile and record its duration and SQL query count. """
+        env = self.env
+        env.flush_all()
+        profile = cProfile.Profile()
+        queries = env.cr.sql_log_count
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            result = func()
+            env.flush_all()
+        finally:
+            profile.disable()
+        duration = time.perf_counter() - start
+        queries = env.cr.sql_log_count - queries
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream).sort_stats('cumulative')
+        stats.print_stats(15)
+        if self.args.profile_dir:
+            stats.dump_stats(os.path.join(self.args.profile_dir, '%s.prof' % stage))
+        self.stages[stage] = {
+            'count': count,
+            'duration': round(duration, 4),
+            'queries': queries,
+            'throughput': round(count / duration, 2) if duration else 0.0,
+            'profile': stream.getvalue().splitlines(),
+        }
+        _logger.info("%s: %s records in %.2fs, %s queries", stage, count, duration, queries)
+        return result
+
+    def run(self):
+        args = self.args
+        data = self.measure('seed', self.seed, args.products + args.vendors + args.customers)
+        requests = self.measure('request_create', lambda: self.create_requests(data), args.requests)
+        rfqs = self.measure('rfq_fanout', lambda: self.create_rfqs(requests),
+                            args.requests * args.vendors_per_request)
+        self.measure('rfq_to_po', lambda: self.create_purchase_orders(rfqs), len(rfqs))
+        self.measure('create_so', lambda: self.create_sale_orders(requests), len(requests))
+        return {
+            'date': fields.Datetime.to_string(fields.Datetime.now()),
+            'database': self.env.cr.dbname,
+            'parameters': {key: value for key, value in vars(args).items()
+                           if key not in ('config', 'output', 'baseline', 'profile_dir')},
+            'stages': self.stages,
+        }
+
+    def seed(self):
+        env, args, rng = self.env, self.args, self.rng
+        company = env.company
+        purchase_tax, sale_tax = env['account.tax'].create([
+            {'name': 'Benchmark Purchase Tax', 'amount': 5, 'type_tax_use': 'purchase', 'company_id': company.id},
+            {'name': 'Benchmark Sale Tax', 'amount': 5, 'type_tax_use': 'sale', 'company_id': company.id},
+        ])
+        vendors = env['res.partner'].create([
+            {'name': 'Benchmark Vendor %s' % i, 'is_company': True, 'supplier_rank': 1}
+            for i in range(args.vendors)
+        ])
+        customers = env['res.partner'].create([
+            {'name': 'Benchmark Customer %s' % i, 'is_company': True, 'customer_rank': 1}
+            for i in range(args.customers)
+        ])
+        products = env['product.product'].create([{
+            'name': 'Benchmark Product %s' % i,
+            'default_code': 'BENCH%05d' % i,
+            'purchase_ok': True,
+            'sale_ok': True,
+            'standard_price': rng.uniform(1, 100),
+            'list_price': rng.uniform(100, 200),
+            'supplier_taxes_id': [(6, 0, purchase_tax.ids)],
+            'taxes_id': [(6, 0, sale_tax.ids)],
+            'seller_ids': [(0, 0, {
+                'partner_id': vendor.id,
+                'price': rng.uniform(1, 100),
+                'delay': rng.randint(1, 30),
+            }) for vendor in rng.sample(list(vendors), min(args.sellers_per_product, len(vendors)))],
+        } for i in range(args.products)])
+        return {'vendors': vendors, 'customers': customers, 'products': products, 'tax': purchase_tax}
+
+    def create_requests(self, data):
+        args, rng = self.args, self.rng
+        return self.env['purchase.request.order'].create([{
+            'partner_id': rng.choice(data['customers']).id,
+            'order_line': [(0, 0, {
+                'product_id': product.id,
+                'product_uom': product.uom_po_id.id,
+                'quantity': rng.randint(1, 100),
+                'taxes_id': [(6, 0, data['tax'].ids)],
+            }) for product in rng.sample(list(data['products']), min(args.lines, len(data['products'])))],
+        } for _i in range(args.requests)])
+
+    def create_rfqs(self, requests):
+        # same fan-out as the vendor selection wizard: one RFQ per vendor with all the request lines
+        vendors = self.env['res.partner'].search([('supplier_rank', '>', 0)])
+        vals_list = []
+        for request in requests:
+            for vendor in self.rng.sample(list(vendors), min(self.args.vendors_per_request, len(vendors))):
+                vals_list.append({
+                    'partner_id': vendor.id,
+                    'request_id': request.id,
+                    'company_id': request.company_id.id,
+                    'currency_id': request.currency_id.id,
+                    'order_line': [(0, 0, {
+                        'purchase_request_line_id': line.id,
+                        'product_id': line.product_id.id,
+                        'quantity': line.quantity,
+                        'product_uom': line.product_uom.id,
+                        'taxes_id': [(6, 0, line.taxes_id.ids)],
+                    }) for line in request.order_line],
+                })
+        return self.env['purchase.rfq'].create(vals_list)
+
+    def create_purchase_orders(self, rfqs):
+        rfqs.action_confirm()
+        for rfq in rfqs:
+            rfq.create_rfq()
+
+    def create_sale_orders(self, requests):
+        for request in requests:
+            request.create_so()
@@ -0,0 +1,42 @@
+import argparse
+import logging
+
+from odoo import api, SUPERUSER_ID
+from odoo.cli import Command
+from odoo.modules.registry import Registry
+from odoo.tools import config
+
+_logger = logging.getLogger(__name__)
+
+
+class PurchaseRequestExport(Command):
+    """ Stream purchase request orders and their lines to a CSV or XLSX file """
+    name = 'purchase_request_export'
+
+    def run(self, cmdargs):
+        parser = argparse.ArgumentParser(prog='odoo-bin purchase_request_export', description=self.__doc__.strip())
+        parser.add_argument('-c', '--config', help="Odoo configuration file")
+        parser.add_argument('-d', '--database', required=True, help="Database to export from")
+        parser.add_argument('-o', '--output', required=True, help="Destination file")
+        parser.add_argument('--format', dest='file_format', choices=['csv', 'xlsx'], default='csv')
+        parser.add_argument('--date-from', help="Only export requests with a deadline on or after this date")
+        parser.add_argument('--date-to', help="Only export requests with a deadline on or before this date")
+        parser.add_argument('--company', dest='company_ids', type=int, action='append', default=[],
+                            help="Company id to export, can be repeated")
+        args = parser.parse_args(cmdargs)
+
+        config.parse_config(['-c', args.config] if args.config else [])
+        registry = Registry(args.database)
+        with registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            companies = env['res.company'].browse(args.company_ids) or env['res.company'].search([])
+            wizard = env['purchase.request.export'].with_context(allowed_company_ids=companies.ids).create({
+                'file_format': args.file_format,
+                'date_from': args.date_from,
+                'date_to': args.date_to,
+                'company_ids': [(6, 0, companies.ids)],
+            })
+            with open(args.output, 'wb') as fp:
+                wizard._export_to_file(fp)
+            wizard.unlink()
+        _logger.info("Purchase requests exported to %s", args.output)
@@ -0,0 +1,177 @@
+import argparse
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+
+from psycopg2 import errors
+
+from odoo import api, fields, SUPERUSER_ID
+from odoo.cli import Command
+from odoo.modules.registry import Registry
+from odoo.tools import config
+
+CONTENTION_ERRORS = (errors.SerializationFailure, errors.LockNotAvailable, errors.DeadlockDetected)
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(percent / 100.0 * len(values)) - 1))
+    return values[index]
+
+
+class PurchaseRequestLoad(Command):
+    """ Simulate concurrent buyers creating, editing and confirming purchase requests and RFQs """
+    name = 'purchase_request_load'
+
+    def run(self, cmdargs):
+        parser = argparse.ArgumentParser(prog='odoo-bin purchase_request_load', description=self.__doc__.strip())
+        parser.add_argument('-c', '--config', help="Odoo configuration file")
+        parser.add_argument('-d', '--database', required=True, help="Database to run against")
+        parser.add_argument('--buyers', type=int, default=8, help="Number of concurrent buyers")
+        parser.add_argument('--iterations', type=int, default=20, help="Requests created by each buyer")
+        parser.add_argument('--lines', type=int, default=10, help="Lines per request")
+        parser.add_argument('--shared-orders', type=int, default=4,
+                            help="Requests and RFQs whose lines every buyer edits, to measure the contention on "
+                                 "order rows. They are committed before the run, even with --rollback")
+        parser.add_argument('--rollback', action='store_true',
+                            help="Roll back every iteration instead of committing it. The buyers then never "
+                                 "wait on each other's committed rows, so contention is not measured")
+        parser.add_argument('--keep', action='store_true',
+                            help="Keep the shared orders and the committed requests and RFQs in the database. "
+                                 "By default they are deleted at the end of the run")
+        parser.add_argument('--seed', type=int, default=None)
+        args = parser.parse_args(cmdargs)
+
+        config.parse_config(['-c', args.config] if args.config else [])
+        registry = Registry(args.database)
+        with registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            products = [(product.id, product.uom_po_id.id)
+                        for product in env['product.product'].search([('purchase_ok', '=', True)], limit=200)]
+            partner_ids = env['res.partner'].search([('is_company', '=', True)], limit=50).ids
+        if not products or not partner_ids:
+            parser.error("the database needs purchasable products and company partners")
+
+        def order_lines_vals(rng):
+            lines = []
+            for _j in range(args.lines):
+                product_id, uom_id = rng.choice(products)
+                lines.append((0, 0, {'product_id': product_id, 'product_uom': uom_id,
+                                     'quantity': rng.randint(1, 50)}))
+            return lines
+
+        rng = random.Random(args.seed)
+        with registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            shared_vals = [{'partner_id': rng.choice(partner_ids), 'order_line': order_lines_vals(rng)}
+                           for _i in range(args.shared_orders)]
+            shared = {
+                'purchase.request.order': env['purchase.request.order'].create(
+                    [dict(vals) for vals in shared_vals]).ids,
+                'purchase.rfq': env['purchase.rfq'].create([dict(vals) for vals in shared_vals]).ids,
+            }
+
+        latencies = defaultdict(list)
+        failures = defaultdict(int)
+        created = defaultdict(list)
+        lock = threading.Lock()
+
+        def measure(operation, func):
+            start = time.perf_counter()
+            try:
+                func()
+            except CONTENTION_ERRORS:
+                with lock:
+                    failures[operation] += 1
+                return False
+            with lock:
+                latencies[operation].append(time.perf_counter() - start)
+            return True
+
+        def buyer(seed):
+            threading.current_thread().dbname = args.database
+            buyer_rng = random.Random(seed)
+            for _i in range(args.iterations):
+                with registry.cursor() as cr:
+                    env = api.Environment(cr, SUPERUSER_ID, {})
+                    records = {}
+
+                    def create():
+                        order_lines = order_lines_vals(buyer_rng)
+                        partner_id = buyer_rng.choice(partner_ids)
+                        records['request'] = env['purchase.request.order'].create({
+                            'partner_id': partner_id, 'order_line': order_lines})
+                        records['rfq'] = env['purchase.rfq'].create({
+                            'partner_id': partner_id, 'order_line': order_lines})
+                        env.flush_all()
+
+                    def edit():
+                        orders = [records['request'], records['rfq']]
+                        if args.shared_orders:
+                            orders += [env[model].browse(buyer_rng.choice(ids)) for model, ids in shared.items()]
+                        for order in orders:
+                            line = buyer_rng.choice(order.order_line)
+                            line.quantity += 1
+                        env.flush_all()
+
+                    def confirm():
+                        records['request'].action_confirm()
+                        records['rfq'].action_confirm()
+                        env.flush_all()
+
+                    start = time.perf_counter()
+                    ok = measure('create', create) and measure('edit', edit) and measure('confirm', confirm)
+                    if ok and not args.rollback:
+                        ok = measure('commit', cr.commit)
+                        if ok:
+                            with lock:
+                                created['purchase.request.order'].append(records['request'].id)
+                                created['purchase.rfq'].append(records['rfq'].id)
+                    if ok:
+                        with lock:
+                            latencies['total'].append(time.perf_counter() - start)
+                    cr.rollback()
+
+        def cleanup():
+            # confirmed orders cannot be deleted, they are put back to draft first
+            with registry.cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                for model in ('purchase.rfq', 'purchase.request.order'):
+                    records = env[model].browse(shared[model] + created[model]).exists()
+                    records.write({'state': 'draft'})
+                    records.unlink()
+
+        threads = [threading.Thread(target=buyer, args=(rng.random(),), name='buyer-%s' % i)
+                   for i in range(args.buyers)]
+        start = time.perf_counter()
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+        finally:
+            if not args.keep:
+                cleanup()
+
+        report = {
+            'date': fields.Datetime.to_string(fields.Datetime.now()),
+            'buyers': args.buyers,
+            'elapsed': round(elapsed, 3),
+            'throughput': round(len(latencies['total']) / elapsed, 3) if elapsed else 0.0,
+            'operations': {
+                operation: {
+                    'count': len(latencies[operation]),
+                    'p50': round(_percentile(latencies[operation], 50), 4),
+                    'p95': round(_percentile(latencies[operation], 95), 4),
+                    'failures': failures[operation],
+                }
+                for operation in sorted(set(latencies) | set(failures))
+            },
+            'serialization_failures': sum(failures.values()),
+        }
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+from werkzeug.exceptions import NotFound
+from werkzeug.wsgi import wrap_file
+
+from odoo import http
+from odoo.http import content_disposition, request
+
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv;charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+class PurchaseRequestExportController(http.Controller):
+
+    @http.route('/purchase_request/export/<int:wizard_id>', type='http', auth='user')
+    def purchase_request_export(self, wizard_id, **kw):
+        wizard = request.env['purchase.request.export'].browse(wizard_id).exists()
+        if not wizard:
+            raise NotFound()
+        # the file is built on disk and streamed from there, it is never loaded in memory
+        fp = tempfile.TemporaryFile()
+        try:
+            wizard._export_to_file(fp)
+            size = fp.seek(0, os.SEEK_END)
+            fp.seek(0)
+        except Exception:
+            fp.close()
+            raise
+        response = request.make_response(
+            wrap_file(request.httprequest.environ, fp),
+            headers=[
+                ('Content-Type', EXPORT_MIMETYPES[wizard.file_format]),
+                ('Content-Length', size),
+                ('Content-Disposition', content_disposition(wizard._get_export_filename())),
+            ],
+        )
+        response.direct_passthrough = True
+        return response
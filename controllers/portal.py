@@ -0,0 +1,65 @@
+from urllib.parse import urlencode
+
+from odoo import http, _lt
+from odoo.exceptions import AccessError, MissingError, UserError
+from odoo.http import request
+
+from odoo.addons.portal.controllers.portal import CustomerPortal
+
+from ..models.purchase_rfq_portal import PORTAL_BID_MAX_LEAD_TIME
+
+# technical name of this addon, imported as odoo.addons.<module>.controllers.portal
+MODULE = __name__.split('.')[2]
+
+# the bid page only shows these messages, the URL carries their code
+BID_ERRORS = {
+    'format': _lt('Prices and lead times must be numbers.'),
+    'values': _lt('Prices must be positive numbers and lead times between 0 and %s days.', PORTAL_BID_MAX_LEAD_TIME),
+    'closed': _lt('This request for quotation is not open for bids anymore.'),
+}
+
+
+class PurchaseRFQPortal(CustomerPortal):
+
+    @http.route(['/my/rfq/<int:rfq_id>'], type='http', auth='public', website=True)
+    def portal_rfq_page(self, rfq_id, access_token=None, submitted=None, error=None, **kw):
+        try:
+            rfq_sudo = self._document_check_access('purchase.rfq', rfq_id, access_token=access_token)
+        except (AccessError, MissingError):
+            return request.redirect('/my')
+        values = {
+            'rfq': rfq_sudo,
+            'snapshot': rfq_sudo._get_portal_bid_snapshot(rfq_sudo.id, rfq_sudo._get_portal_bid_stamp()),
+            'access_token': access_token,
+            'submitted': submitted,
+            'error': str(BID_ERRORS[error]) if error in BID_ERRORS else None,
+            'page_name': 'rfq',
+        }
+        return request.render('%s.portal_rfq_bid' % MODULE, values)
+
+    @http.route(['/my/rfq/<int:rfq_id>/bid'], type='http', auth='public', methods=['POST'], website=True)
+    def portal_rfq_bid(self, rfq_id, access_token=None, **post):
+        try:
+            rfq_sudo = self._document_check_access('purchase.rfq', rfq_id, access_token=access_token)
+        except (AccessError, MissingError):
+            return request.redirect('/my')
+
+        bids = {}
+        try:
+            for line_id in rfq_sudo.order_line.ids:
+                price_unit = post.get('price_%s' % line_id)
+                if price_unit in (None, ''):
+                    continue
+                lead_time = post.get('lead_time_%s' % line_id)
+                bids[line_id] = (float(price_unit), int(lead_time) if lead_time not in (None, '') else None)
+        except ValueError:
+            return request.redirect(rfq_sudo.get_portal_url(query_string='&' + urlencode({'error': 'format'})))
+        if rfq_sudo.state != 'draft':
+            return request.redirect(rfq_sudo.get_portal_url(query_string='&' + urlencode({'error': 'closed'})))
+
+        # the values themselves (nan, infinity, out of range) are checked by the model
+        try:
+            rfq_sudo._apply_portal_bid(bids)
+        except UserError:
+            return request.redirect(rfq_sudo.get_portal_url(query_string='&' + urlencode({'error': 'values'})))
+        return request.redirect(rfq_sudo.get_portal_url(query_string='&submitted=1'))
@@ -1 +1,7 @@
-from . import purchase_request
\ No newline at end of file
+from . import purchase_request
+from . import purchase_request_export
+from . import purchase_rfq_batch
+from . import purchase_request_replenishment
+from . import purchase_request_quote
+from . import purchase_rfq_portal
+from . import purchase_sync
@@ -6,6 +6,32 @@ from dateutil.relativedelta import relativedelta
 import datetime
 
 
+def _copy_stored_computed_values(lines, default, vals_list):
+    """ Put the stored computed values of ``lines`` in their copy values, so that the
+    copies are inserted with their final values instead of being recomputed. A value is
+    left out, hence recomputed, when one of its dependencies is overridden in ``default``,
+    directly or through another value that is recomputed. """
+    computed = {
+        fname: field for fname, field in lines._fields.items()
+        if field.compute and field.store and not field.related
+    }
+    changed = set(default)
+    while True:
+        stale = {
+            fname for fname, field in computed.items()
+            if fname not in changed and any(
+                dep.split('.')[0] in changed for dep in lines.pool.field_depends[field])
+        }
+        if not stale:
+            break
+        changed |= stale
+    for line, vals in zip(lines, vals_list):
+        for fname, field in computed.items():
+            if fname not in changed:
+                vals[fname] = field.convert_to_write(line[fname], line)
+    return vals_list
+
+
 class PurchaseRequestOrder(models.Model):
     _name = "purchase.request.order"
     _inherit = ['mail.thread', 'mail.activity.mixin']
@@ -28,9 +54,13 @@ class PurchaseRequestOrder(models.Model):
                 amount_untaxed = sum(order_lines.mapped('price_subtotal'))
                 amount_tax = sum(order_lines.mapped('price_tax'))
 
-            order.amount_untaxed = amount_untaxed
-            order.amount_tax = amount_tax
-            order.amount_total = order.amount_untaxed + order.amount_tax
+            # only assign the totals that change: the order row is then neither updated
+            # nor locked when a line edit leaves them as they are
+            currency = order.currency_id or order.company_id.currency_id
+            for fname, amount in (('amount_untaxed', amount_untaxed), ('amount_tax', amount_tax),
+                                  ('amount_total', amount_untaxed + amount_tax)):
+                if currency.compare_amounts(order[fname], amount):
+                    order[fname] = amount
 
     partner_id = fields.Many2one('res.partner', string='Customer', required=True, change_default=True, tracking=True,
                                  domain="['|', ('company_id', '=', False), ('company_id', '=', company_id),('partner_type','=','customer')]",
@@ -57,7 +87,7 @@ class PurchaseRequestOrder(models.Model):
         default=lambda self: self.env.user, check_company=True)
     company_id = fields.Many2one('res.company', 'Company', required=True, index=True,
                                  default=lambda self: self.env.company.id)
-    notes = fields.Html('Terms and Conditions')
+    notes = fields.Html('Terms and Conditions', prefetch=False)
     incoterm_id = fields.Many2one('account.incoterms', 'Incoterm', states={'done': [('readonly', True)]},
                                   help="International Commercial Terms are a series of predefined commercial terms used in international transactions.")
     fiscal_position_id = fields.Many2one('account.fiscal.position', string='Fiscal Position',
@@ -80,7 +110,8 @@ class PurchaseRequestOrder(models.Model):
     request_id = fields.Many2one('purchase.order', 'Purchase Request')
 
     def action_confirm(self):
-        self.state = 'rfq'
+        # only touch the rows that actually change state, to avoid locking them needlessly
+        self.filtered(lambda order: order.state != 'rfq').write({'state': 'rfq'})
 
     def unlink(self):
         for record in self:
@@ -88,6 +119,13 @@ class PurchaseRequestOrder(models.Model):
                 raise UserError('You can only delete Records in Draft State.')
         return super(PurchaseRequestOrder, self).unlink()
 
+    def copy_data(self, default=None):
+        # copies restart from draft; the totals are recomputed once the copied lines
+        # are inserted, with their carried over amounts
+        default = dict(default or {})
+        default.setdefault('state', 'draft')
+        return super(PurchaseRequestOrder, self).copy_data(default=default)
+
     def create_so(self):
         pl = self.env['product.pricelist'].search([('name', '=', 'Default AED pricelist')], limit=1)
         so_vals = {
@@ -177,14 +215,14 @@ class PurchaseRequestOrder(models.Model):
     #     }
     #     return action
 
-    @api.model
-    def create(self, vals):
-        if not vals.get('note'):
-            vals['note'] = 'New Form'
-        if vals.get('name', _('New')) == _('New'):
-            vals['name'] = self.env['ir.sequence'].next_by_code('purchase.request.order') or _('New')
-            res = super(PurchaseRequestOrder, self).create(vals)
-            return res
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if not vals.get('note'):
+                vals['note'] = 'New Form'
+            if vals.get('name', _('New')) == _('New'):
+                vals['name'] = self.env['ir.sequence'].next_by_code('purchase.request.order') or _('New')
+        return super(PurchaseRequestOrder, self).create(vals_list)
 
     @api.depends('order_line.taxes_id', 'order_line.price_subtotal', 'amount_total', 'amount_untaxed')
     def _compute_tax_totals(self):
@@ -261,17 +299,19 @@ class PurchaseRequestOrderLine(models.Model):
 
     product_id = fields.Many2one('product.product', string='Product', domain=[('purchase_ok', '=', True)],
                                  change_default=True, index='btree_not_null')
-    name = fields.Text('Description', compute='_compute_description', store=True, readonly=False)
+    name = fields.Text('Description', compute='_compute_description', store=True, readonly=False, precompute=True)
     quantity = fields.Float('Quantity', digits='Product Unit of Measure', required=True, store=True,
                             default="1")
     date_planned = fields.Datetime(
         string='Expected Arrival', index=True,
-        compute="_compute_price_unit_and_date_planned_and_name", readonly=False, store=True, tracking=True,
+        compute="_compute_price_unit_and_date_planned_and_name", readonly=False, store=True, precompute=True,
+        tracking=True,
         help="Delivery date expected from vendor. This date respectively defaults to vendor pricelist lead time then today's date.")
     taxes_id = fields.Many2many('account.tax', string='Taxes',
                                 domain=['|', ('active', '=', False), ('active', '=', True)])
     product_uom_category_id = fields.Many2one(related='product_id.uom_id.category_id')
     product_uom = fields.Many2one('uom.uom', string='Unit of Measure', required=True,
+                                  compute='_compute_product_uom', store=True, readonly=False, precompute=True,
                                   domain="[('category_id', '=', product_uom_category_id)]")
     order_id = fields.Many2one('purchase.request.order', string='Order Reference', index=True, required=True,
                                ondelete='cascade')
@@ -280,18 +320,19 @@ class PurchaseRequestOrderLine(models.Model):
                                  readonly=True)
     price_unit = fields.Float(
         string='Unit Price', digits='Product Price',
-     readonly=False, store=True)
+        compute="_compute_price_unit_and_date_planned_and_name", readonly=False, store=True, precompute=True)
 
     purchase_price = fields.Float(string='Purchase Price', digits='Product Price', compute="_compute_purchase_price",)
     sale_price = fields.Float(string='Sale Price', digits='Product Price', compute="_compute_sale_price",)
-    price_subtotal = fields.Monetary(compute='_compute_amount', string='Subtotal', store=True)
-    price_total = fields.Monetary(compute='_compute_amount', string='Total', store=True)
+    price_subtotal = fields.Monetary(compute='_compute_amount', string='Subtotal', store=True, precompute=True)
+    price_total = fields.Monetary(compute='_compute_amount', string='Total', store=True, precompute=True)
     product_packaging_qty = fields.Float('Packaging Quantity', compute="_compute_product_packaging_qty", store=True,
-                                         readonly=False)
+                                         readonly=False, precompute=True)
     product_packaging_id = fields.Many2one('product.packaging', string='Packaging',
                                            domain="[('product_id', '=', product_id)]",
                                            check_company=True,
-                                           compute="_compute_product_packaging_id", store=True, readonly=False)
+                                           compute="_compute_product_packaging_id", store=True, readonly=False,
+                                           precompute=True)
     date_order = fields.Datetime(related='order_id.date_order', string='Order Date', readonly=True)
 
     sequence = fields.Integer(string='Sequence', default=10)
@@ -300,31 +341,36 @@ class PurchaseRequestOrderLine(models.Model):
         string="Product Template",
         related='product_id.product_tmpl_id',
         domain=[('purchase_ok', '=', True)])
-    price_tax = fields.Float(compute='_compute_amount', string='Tax', store=True)
+    price_tax = fields.Float(compute='_compute_amount', string='Tax', store=True, precompute=True)
     display_type = fields.Selection([
         ('line_section', "Section"),
         ('line_note', "Note")], default=False, help="Technical field for UX purpose.")
 
 
     def _compute_purchase_price(self):
-        for rec in self:
-            print()
-            rec.purchase_price =0
+        self.purchase_price = 0
 
     def _compute_sale_price(self):
-        for rec in self:
-            print()
-            rec.sale_price = 0
+        self.sale_price = 0
 
     @api.depends('product_id')
     def _compute_description(self):
         for each in self:
             if each.product_id:
                 each.name = each.product_id.name
-                each.product_uom = each.product_id.uom_po_id.id
             else:
                 each.name = ''
 
+    @api.depends('product_id')
+    def _compute_product_uom(self):
+        for each in self:
+            each.product_uom = each.product_id.uom_po_id or each.product_uom
+
+    def copy_data(self, default=None):
+        default = default or {}
+        vals_list = super(PurchaseRequestOrderLine, self).copy_data(default=default)
+        return _copy_stored_computed_values(self, default, vals_list)
+
     def _convert_to_tax_base_line_dict(self):
         self.ensure_one()
         return self.env['account.tax']._convert_to_tax_base_line_dict(
@@ -447,12 +493,17 @@ class SaleOrder(models.Model):
     @api.model_create_multi
     def create(self, vals):
         res = super(SaleOrder, self).create(vals)
-        for line in res.order_line:
-            if not line.product_id.taxes_id:
-                request_line = self.env['purchase.request.order.line'].search([
-                    ('order_id', '=', res.request_id.id),
-                    ('product_id', '=', line.product_id.id)
-                ], limit=1)
+        lines = res.order_line.filtered(lambda l: l.order_id.request_id and not l.product_id.taxes_id)
+        if lines:
+            # fetch the request lines once instead of searching for every sale order line
+            request_lines = {}
+            for request_line in self.env['purchase.request.order.line'].search([
+                ('order_id', 'in', lines.order_id.request_id.ids),
+                ('product_id', 'in', lines.product_id.ids),
+            ], order='id desc'):
+                request_lines[request_line.order_id, request_line.product_id] = request_line
+            for line in lines:
+                request_line = request_lines.get((line.order_id.request_id, line.product_id))
                 if request_line:
                     line.tax_id = [(6, 0, request_line.taxes_id.ids)]
         return res
@@ -556,9 +607,13 @@ class PurchaseRFQ(models.Model):
                 amount_untaxed = sum(order_lines.mapped('price_subtotal'))
                 amount_tax = sum(order_lines.mapped('price_tax'))
 
-            order.amount_untaxed = amount_untaxed
-            order.amount_tax = amount_tax
-            order.amount_total = order.amount_untaxed + order.amount_tax
+            # only assign the totals that change: the order row is then neither updated
+            # nor locked when a line edit leaves them as they are
+            currency = order.currency_id or order.company_id.currency_id
+            for fname, amount in (('amount_untaxed', amount_untaxed), ('amount_tax', amount_tax),
+                                  ('amount_total', amount_untaxed + amount_tax)):
+                if currency.compare_amounts(order[fname], amount):
+                    order[fname] = amount
 
     request_id = fields.Many2one('purchase.request.order', 'Purchase Request')
     partner_id = fields.Many2one('res.partner', string='Vendor', required=True, change_default=True, tracking=True,
@@ -588,7 +643,7 @@ class PurchaseRFQ(models.Model):
         default=lambda self: self.env.user, check_company=True)
     company_id = fields.Many2one('res.company', 'Company', required=True, index=True,
                                  default=lambda self: self.env.company.id)
-    notes = fields.Html('Terms and Conditions')
+    notes = fields.Html('Terms and Conditions', prefetch=False)
     incoterm_id = fields.Many2one('account.incoterms', 'Incoterm', states={'done': [('readonly', True)]},
                                   help="International Commercial Terms are a series of predefined commercial terms used in international transactions.")
     fiscal_position_id = fields.Many2one('account.fiscal.position', string='Fiscal Position',
@@ -611,43 +666,24 @@ class PurchaseRFQ(models.Model):
     purchase_order_id = fields.Many2one('purchase.order')
 
     def action_confirm(self):
-        self.state = 'confirm'
+        self.filtered(lambda order: order.state != 'confirm').write({'state': 'confirm'})
 
     def unlink(self):
         for record in self:
             if record.state != 'draft':
                 raise UserError('You can only delete Records in Draft State.')
-        return super(PurchaseRequestOrder, self).unlink()
+        return super(PurchaseRFQ, self).unlink()
 
-    def create_rfq(self):
-        rfq_vals = {
-            'date_order': self.date_order,
-            'currency_id': self.currency_id.id,
-            'date_planned': self.date_planned,
-            'user_id': self.user_id.id,
-            'company_id': self.company_id.id,
-            'payment_term_id': self.payment_term_id.id,
-            'fiscal_position_id': self.fiscal_position_id.id,
-            'request_id': self.id,
-            'order_line': [],
-            'partner_id': self.partner_id.id,
-            'request_order_id': self.request_id.id,
-        }
+    def copy_data(self, default=None):
+        # copies restart from draft; the totals are recomputed once the copied lines
+        # are inserted, with their carried over amounts
+        default = dict(default or {})
+        default.setdefault('state', 'draft')
+        default.setdefault('purchase_order_id', False)
+        return super(PurchaseRFQ, self).copy_data(default=default)
 
-        for line in self.order_line:
-            order_line_vals = {
-                'purchase_request_line_id': line.id,
-                'product_id': line.product_id.id,
-                'name': line.name,
-                'product_qty': line.quantity,
-                'product_uom': line.product_uom.id,
-                'product_packaging_qty': line.product_packaging_qty,
-                'product_packaging_id': line.product_packaging_id.id,
-                'price_unit': line.price_unit,
-                'taxes_id': [(6, 0, line.taxes_id.ids)],
-            }
-            rfq_vals['order_line'].append((0, 0, order_line_vals))
-        po = self.env['purchase.order'].create(rfq_vals)
+    def create_rfq(self):
+        po = self._create_purchase_order()
         action = {
             'type': 'ir.actions.act_window',
             'name': 'Create RFQ',
@@ -669,14 +705,53 @@ class PurchaseRFQ(models.Model):
         }
         return action
 
-    @api.model
-    def create(self, vals):
-        if not vals.get('note'):
-            vals['note'] = 'New Form'
-        if vals.get('name', _('New')) == _('New'):
-            vals['name'] = self.env['ir.sequence'].next_by_code('purchase.rfq') or _('New')
-            res = super(PurchaseRFQ, self).create(vals)
-            return res
+    def _create_purchase_order(self):
+        """ Convert the RFQ into a purchase order and mark it as done. """
+        self.ensure_one()
+        return self._create_purchase_orders()
+
+    def _create_purchase_orders(self, lines_by_rfq=None):
+        """ Convert the RFQs into purchase orders, created in one batch, and mark them as done.
+
+        :param dict lines_by_rfq: optional ``{rfq: rfq_lines}`` restricting the lines put
+            on the purchase order of some RFQs
+        """
+        lines_by_rfq = lines_by_rfq or {}
+        pos = self.env['purchase.order'].create([
+            rfq._prepare_purchase_order_vals(lines_by_rfq.get(rfq)) for rfq in self
+        ])
+        for rfq, po in zip(self, pos):
+            rfq.write({'purchase_order_id': po.id, 'state': 'done'})
+        return pos
+
+    def _prepare_purchase_order_vals(self, lines=None):
+        self.ensure_one()
+        rfq_vals = {
+            'date_order': self.date_order,
+            'currency_id': self.currency_id.id,
+            'date_planned': self.date_planned,
+            'user_id': self.user_id.id,
+            'company_id': self.company_id.id,
+            'payment_term_id': self.payment_term_id.id,
+            'fiscal_position_id': self.fiscal_position_id.id,
+            'request_id': self.id,
+            'order_line': [],
+            'partner_id': self.partner_id.id,
+            'request_order_id': self.request_id.id,
+        }
+
+        for line in self.order_line if lines is None else lines:
+            rfq_vals['order_line'].append((0, 0, line._prepare_purchase_order_line_vals()))
+        return rfq_vals
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if not vals.get('note'):
+                vals['note'] = 'New Form'
+            if vals.get('name', _('New')) == _('New'):
+                vals['name'] = self.env['ir.sequence'].next_by_code('purchase.rfq') or _('New')
+        return super(PurchaseRFQ, self).create(vals_list)
 
     @api.depends('order_line.taxes_id', 'order_line.price_subtotal', 'amount_total', 'amount_untaxed')
     def _compute_tax_totals(self):
@@ -750,17 +825,19 @@ class PurchaseRFQLine(models.Model):
     purchase_request_line_id = fields.Many2one('purchase.request.order.line', store=True)
     product_id = fields.Many2one('product.product', string='Product', domain=[('purchase_ok', '=', True)],
                                  change_default=True, index='btree_not_null')
-    name = fields.Text('Description', compute='_compute_description', store=True, readonly=False)
+    name = fields.Text('Description', compute='_compute_description', store=True, readonly=False, precompute=True)
     quantity = fields.Float('Quantity', digits='Product Unit of Measure', required=True, store=True,
                             default="1")
     date_planned = fields.Datetime(
         string='Expected Arrival', index=True,
-        compute="_compute_price_unit_and_date_planned_and_name", readonly=False, store=True, tracking=True,
+        compute="_compute_price_unit_and_date_planned_and_name", readonly=False, store=True, precompute=True,
+        tracking=True,
         help="Delivery date expected from vendor. This date respectively defaults to vendor pricelist lead time then today's date.")
     taxes_id = fields.Many2many('account.tax', string='Taxes',
                                 domain=['|', ('active', '=', False), ('active', '=', True)])
     product_uom_category_id = fields.Many2one(related='product_id.uom_id.category_id')
     product_uom = fields.Many2one('uom.uom', string='Unit of Measure', required=True,
+                                  compute='_compute_product_uom', store=True, readonly=False, precompute=True,
                                   domain="[('category_id', '=', product_uom_category_id)]")
     order_id = fields.Many2one('purchase.rfq', string='Order Reference', index=True, required=True,
                                ondelete='cascade')
@@ -769,15 +846,16 @@ class PurchaseRFQLine(models.Model):
                                  readonly=True)
     price_unit = fields.Float(
         string='Unit Price', required=True, digits='Product Price',
-        compute="_compute_price_unit_and_date_planned_and_name", readonly=False, store=True)
-    price_subtotal = fields.Monetary(compute='_compute_amount', string='Subtotal', store=True)
-    price_total = fields.Monetary(compute='_compute_amount', string='Total', store=True)
+        compute="_compute_price_unit_and_date_planned_and_name", readonly=False, store=True, precompute=True)
+    price_subtotal = fields.Monetary(compute='_compute_amount', string='Subtotal', store=True, precompute=True)
+    price_total = fields.Monetary(compute='_compute_amount', string='Total', store=True, precompute=True)
     product_packaging_qty = fields.Float('Packaging Quantity', compute="_compute_product_packaging_qty", store=True,
-                                         readonly=False)
+                                         readonly=False, precompute=True)
     product_packaging_id = fields.Many2one('product.packaging', string='Packaging',
                                            domain="[('product_id', '=', product_id)]",
                                            check_company=True,
-                                           compute="_compute_product_packaging_id", store=True, readonly=False)
+                                           compute="_compute_product_packaging_id", store=True, readonly=False,
+                                           precompute=True)
     date_order = fields.Datetime(related='order_id.date_order', string='Order Date', readonly=True)
 
     sequence = fields.Integer(string='Sequence', default=10)
@@ -786,7 +864,7 @@ class PurchaseRFQLine(models.Model):
         string="Product Template",
         related='product_id.product_tmpl_id',
         domain=[('purchase_ok', '=', True)])
-    price_tax = fields.Float(compute='_compute_amount', string='Tax', store=True)
+    price_tax = fields.Float(compute='_compute_amount', string='Tax', store=True, precompute=True)
     display_type = fields.Selection([
         ('line_section', "Section"),
         ('line_note', "Note")], default=False, help="Technical field for UX purpose.")
@@ -796,10 +874,33 @@ class PurchaseRFQLine(models.Model):
         for each in self:
             if each.product_id:
                 each.name = each.product_id.name
-                each.product_uom = each.product_id.uom_po_id.id
             else:
                 each.name = ''
 
+    @api.depends('product_id')
+    def _compute_product_uom(self):
+        for each in self:
+            each.product_uom = each.product_id.uom_po_id or each.product_uom
+
+    def copy_data(self, default=None):
+        default = default or {}
+        vals_list = super(PurchaseRFQLine, self).copy_data(default=default)
+        return _copy_stored_computed_values(self, default, vals_list)
+
+    def _prepare_purchase_order_line_vals(self):
+        self.ensure_one()
+        return {
+            'purchase_request_line_id': self.id,
+            'product_id': self.product_id.id,
+            'name': self.name,
+            'product_qty': self.quantity,
+            'product_uom': self.product_uom.id,
+            'product_packaging_qty': self.product_packaging_qty,
+            'product_packaging_id': self.product_packaging_id.id,
+            'price_unit': self.price_unit,
+            'taxes_id': [(6, 0, self.taxes_id.ids)],
+        }
+
     def _convert_to_tax_base_line_dict(self):
         self.ensure_one()
         return self.env['account.tax']._convert_to_tax_base_line_dict(
@@ -0,0 +1,139 @@
+import csv
+import datetime
+import io
+
+import xlsxwriter
+
+from odoo import fields, models, _
+from odoo.tools import SQL
+
+EXPORT_BATCH_SIZE = 2000
+
+# rows per worksheet allowed by the XLSX format, header included
+XLSX_MAX_ROWS = 1048576
+
+EXPORT_HEADER = [
+    'Reference No.', 'Order Deadline', 'Customer', 'Company', 'Currency', 'Buyer', 'State',
+    'Untaxed Amount', 'Taxes', 'Total',
+    'Line Type', 'Product', 'Description', 'Quantity', 'Unit of Measure', 'Unit Price',
+    'Subtotal', 'Tax', 'Line Total', 'Expected Arrival',
+]
+
+
+class PurchaseRequestExport(models.TransientModel):
+    _name = 'purchase.request.export'
+    _description = 'Purchase Request Export'
+
+    file_format = fields.Selection([('csv', 'CSV'), ('xlsx', 'XLSX')], string='Format', required=True,
+                                   default='csv')
+    date_from = fields.Datetime('From')
+    date_to = fields.Datetime('To')
+    company_ids = fields.Many2many('res.company', string='Companies', default=lambda self: self.env.companies)
+
+    def _get_export_domain(self):
+        domain = []
+        if self.date_from:
+            domain.append(('date_order', '>=', self.date_from))
+        if self.date_to:
+            domain.append(('date_order', '<=', self.date_to))
+        if self.company_ids:
+            domain.append(('company_id', 'in', self.company_ids.ids))
+        return domain
+
+    def _get_export_query(self):
+        # Only stored columns are selected; many2one values are resolved to their names
+        # with joins so that no record ever enters the ORM cache.
+        lang = self.env.lang or 'en_US'
+        orders = self.env['purchase.request.order']._search(self._get_export_domain())
+        return SQL("""
+            SELECT o.name, o.date_order, partner.name, company.name, currency.name, buyer.name, o.state,
+                   o.amount_untaxed, o.amount_tax, o.amount_total,
+                   l.display_type,
+                   CASE WHEN pp.default_code IS NOT NULL
+                        THEN '[' || pp.default_code || '] ' || COALESCE(pt.name->>%s, pt.name->>'en_US')
+                        ELSE COALESCE(pt.name->>%s, pt.name->>'en_US')
+                   END,
+                   l.name, l.quantity, COALESCE(uom.name->>%s, uom.name->>'en_US'), l.price_unit,
+                   l.price_subtotal, l.price_tax, l.price_total, l.date_planned
+              FROM purchase_request_order o
+              JOIN res_partner partner ON partner.id = o.partner_id
+              JOIN res_company company ON company.id = o.company_id
+              JOIN res_currency currency ON currency.id = o.currency_id
+         LEFT JOIN res_users users ON users.id = o.user_id
+         LEFT JOIN res_partner buyer ON buyer.id = users.partner_id
+         LEFT JOIN purchase_request_order_line l ON l.order_id = o.id
+         LEFT JOIN product_product pp ON pp.id = l.product_id
+         LEFT JOIN product_template pt ON pt.id = pp.product_tmpl_id
+         LEFT JOIN uom_uom uom ON uom.id = l.product_uom
+             WHERE o.id IN %s
+          ORDER BY o.date_order, o.id, l.sequence, l.id
+        """, lang, lang, lang, orders.subselect())
+
+    def _iter_export_rows(self, batch_size=EXPORT_BATCH_SIZE):
+        """ Yield the export rows, fetched in batches through a server-side cursor. """
+        self.env['purchase.request.order'].flush_model()
+        self.env['purchase.request.order.line'].flush_model()
+        cr = self.env.cr
+        cursor_name = SQL.identifier('purchase_request_export_%s' % (self.id or 0))
+        cr.execute(SQL("DECLARE %s NO SCROLL CURSOR FOR %s", cursor_name, self._get_export_query()))
+        try:
+            while True:
+                cr.execute(SQL("FETCH FORWARD %s FROM %s", batch_size, cursor_name))
+                rows = cr.fetchall()
+                if not rows:
+                    break
+                for row in rows:
+                    yield [fields.Datetime.to_string(value) if isinstance(value, datetime.datetime) else value
+                           for value in row]
+        finally:
+            cr.execute(SQL("CLOSE %s", cursor_name))
+
+    def _export_csv(self, fp):
+        stream = io.TextIOWrapper(fp, encoding='utf-8', newline='')
+        try:
+            writer = csv.writer(stream)
+            writer.writerow(EXPORT_HEADER)
+            for row in self._iter_export_rows():
+                writer.writerow(['' if value is None else value for value in row])
+        finally:
+            stream.detach()
+
+    def _export_xlsx(self, fp):
+        # constant_memory flushes each row to disk as soon as the next one starts
+        workbook = xlsxwriter.Workbook(fp, {'constant_memory': True})
+        bold = workbook.add_format({'bold': True})
+        worksheet, row_index = None, XLSX_MAX_ROWS
+        for row in self._iter_export_rows():
+            # roll over to a new sheet instead of letting xlsxwriter drop the rows
+            if row_index >= XLSX_MAX_ROWS:
+                sheet_number = len(workbook.worksheets()) + 1
+                sheet_name = _('Purchase Requests') if sheet_number == 1 else _('Purchase Requests %s', sheet_number)
+                worksheet = workbook.add_worksheet(sheet_name)
+                worksheet.write_row(0, 0, EXPORT_HEADER, bold)
+                row_index = 1
+            worksheet.write_row(row_index, 0, row)
+            row_index += 1
+        if worksheet is None:
+            workbook.add_worksheet(_('Purchase Requests')).write_row(0, 0, EXPORT_HEADER, bold)
+        workbook.close()
+
+    def _export_to_file(self, fp):
+        """ Write the export to the binary file object ``fp``. """
+        self.ensure_one()
+        if self.file_format == 'xlsx':
+            self._export_xlsx(fp)
+        else:
+            self._export_csv(fp)
+
+    def _get_export_filename(self):
+        return 'purchase_requests.%s' % self.file_format
+
+    def action_export(self):
+        # the file is streamed by the /purchase_request/export controller, it never goes
+        # through a binary field
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/purchase_request/export/%s' % self.id,
+            'target': 'self',
+        }
@@ -0,0 +1,221 @@
+from collections import defaultdict
+
+from odoo import api, fields, models, tools, _, Command
+from odoo.exceptions import UserError
+
+from .purchase_rfq_batch import RFQ_BATCH_LOCK_KEY
+
+
+class PurchaseRequestOrder(models.Model):
+    _inherit = 'purchase.request.order'
+
+    def _get_quote_stamp(self):
+        """ Return a value that changes whenever the request lines, an RFQ of the request
+        or one of its lines is created, modified or deleted. """
+        self.ensure_one()
+        self.env['purchase.request.order.line'].flush_model()
+        self.env['purchase.rfq'].flush_model()
+        self.env['purchase.rfq.line'].flush_model()
+        self.env.cr.execute("""
+            SELECT COUNT(DISTINCT r.id), MAX(r.write_date), COUNT(l.id), MAX(l.write_date),
+                   (SELECT COUNT(*) FROM purchase_request_order_line WHERE order_id = %(request_id)s),
+                   (SELECT MAX(write_date) FROM purchase_request_order_line WHERE order_id = %(request_id)s)
+              FROM purchase_rfq r
+         LEFT JOIN purchase_rfq_line l ON l.order_id = r.id
+             WHERE r.request_id = %(request_id)s
+        """, {'request_id': self.id})
+        return self.env.cr.fetchone()
+
+    @api.model
+    @tools.ormcache('request_id', 'stamp', 'self.env.lang')
+    def _get_quote_matrix(self, request_id, stamp):
+        # all the quotes of the RFQs that are not converted yet, in a single query
+        self.env.cr.execute("""
+            SELECT l.purchase_request_line_id, r.partner_id, r.id, l.id, l.price_unit, l.price_subtotal,
+                   l.date_planned, r.date_order, l.product_packaging_id, l.product_packaging_qty,
+                   r.currency_id, l.product_uom
+              FROM purchase_rfq_line l
+              JOIN purchase_rfq r ON r.id = l.order_id
+             WHERE r.request_id = %s
+               AND r.state != 'done'
+               AND r.purchase_order_id IS NULL
+               AND l.purchase_request_line_id IS NOT NULL
+               AND l.display_type IS NULL
+          ORDER BY l.id
+        """, [request_id])
+        rows = self.env.cr.fetchall()
+
+        request = self.sudo().browse(request_id)
+        request_lines = request.order_line.filtered(lambda l: not l.display_type)
+        vendors = self.env['res.partner'].sudo().browse({row[1] for row in rows})
+        packagings = self.env['product.packaging'].sudo().browse({row[8] for row in rows if row[8]})
+        currencies = self.env['res.currency'].browse({row[10] for row in rows})
+        uoms = self.env['uom.uom'].browse({row[11] for row in rows})
+        request_currency = request.currency_id or request.company_id.currency_id
+
+        # the quotes are compared in the currency of the request and per unit of measure
+        # of the request line, only the cheapest quote of every vendor is kept
+        quotes_by_line = defaultdict(dict)
+        for (line_id, partner_id, rfq_id, rfq_line_id, price_unit, price_subtotal,
+             date_planned, date_order, packaging_id, packaging_qty, currency_id, uom_id) in rows:
+            request_line = request_lines.browse(line_id)
+            if request_line not in request_lines:
+                continue
+            price = currencies.browse(currency_id)._convert(
+                price_unit, request_currency, request.company_id, date_order or fields.Date.today(), round=False)
+            if uom_id and request_line.product_uom:
+                price = uoms.browse(uom_id)._compute_price(price, request_line.product_uom)
+            quote = {
+                'vendor_id': partner_id,
+                'rfq_id': rfq_id,
+                'rfq_line_id': rfq_line_id,
+                'price_unit': price_unit,
+                'price_subtotal': price_subtotal,
+                'currency_id': currency_id,
+                'price_unit_normalized': request_currency.round(price),
+                'lead_time': (date_planned - date_order).days if date_planned and date_order else False,
+                'date_planned': date_planned,
+                'product_packaging': packagings.browse(packaging_id).display_name if packaging_id else False,
+                'product_packaging_qty': packaging_qty,
+            }
+            current = quotes_by_line[line_id].get(partner_id)
+            if current is None or self._get_quote_sort_key(quote) < self._get_quote_sort_key(current):
+                quotes_by_line[line_id][partner_id] = quote
+
+        lines = []
+        for line in request_lines:
+            quotes = list(quotes_by_line[line.id].values())
+            best = min(quotes, key=self._get_quote_sort_key, default=None)
+            lines.append({
+                'id': line.id,
+                'product': line.product_id.display_name,
+                'name': line.name,
+                'quantity': line.quantity,
+                'product_uom': line.product_uom.display_name,
+                'quotes': quotes,
+                'best_vendor_id': best['vendor_id'] if best else False,
+            })
+        return {
+            'currency_id': request_currency.id,
+            'vendors': [{'id': vendor.id, 'name': vendor.display_name} for vendor in vendors.sorted('display_name')],
+            'lines': lines,
+        }
+
+    @api.model
+    def _get_quote_sort_key(self, quote):
+        return (quote['price_unit_normalized'], quote['lead_time'] is False, quote['lead_time'] or 0,
+                quote['vendor_id'], quote['rfq_line_id'])
+
+    def get_vendor_quote_matrix(self):
+        """ Return the request line x vendor comparison of the quotes received on the RFQs
+        of the request that are not converted into purchase orders yet. The result is
+        cached until the request lines or one of these RFQs change. """
+        self.ensure_one()
+        self.check_access_rights('read')
+        self.check_access_rule('read')
+        return self._get_quote_matrix(self.id, self._get_quote_stamp())
+
+    def action_create_po_from_best_quotes(self, selection=None):
+        """ Create one purchase order per RFQ holding a selected quote, and mark these RFQs
+        as done, like the conversion of a whole RFQ does.
+
+        :param dict selection: optional ``{request_line_id: vendor_id}`` overriding the
+            best vendor of some lines, a falsy vendor leaves the line out
+        """
+        self.ensure_one()
+        selection = {int(line_id): vendor_id for line_id, vendor_id in (selection or {}).items()}
+        rfq_line_ids = []
+        for line in self.get_vendor_quote_matrix()['lines']:
+            vendor_id = selection.get(line['id'], line['best_vendor_id'])
+            quote = next((q for q in line['quotes'] if q['vendor_id'] == vendor_id), None)
+            if quote:
+                rfq_line_ids.append(quote['rfq_line_id'])
+        if not rfq_line_ids:
+            raise UserError(_('There is no vendor quote to create a purchase order from.'))
+
+        rfq_lines_by_rfq = defaultdict(lambda: self.env['purchase.rfq.line'])
+        for rfq_line in self.env['purchase.rfq.line'].browse(rfq_line_ids):
+            rfq_lines_by_rfq[rfq_line.order_id] |= rfq_line
+        rfqs = self.env['purchase.rfq'].concat(*rfq_lines_by_rfq)
+
+        # same lock as the batch conversion, an RFQ is never converted twice
+        for rfq in rfqs:
+            self.env.cr.execute("SELECT pg_try_advisory_xact_lock(%s, %s)", [RFQ_BATCH_LOCK_KEY, rfq.id])
+            if not self.env.cr.fetchone()[0]:
+                raise UserError(_('The RFQ %s is being converted into a purchase order, try again later.',
+                                  rfq.display_name))
+        rfqs.invalidate_recordset(['state', 'purchase_order_id'])
+        converted = rfqs.filtered(lambda rfq: rfq.state == 'done' or rfq.purchase_order_id)
+        if converted:
+            raise UserError(_('These RFQs are already converted into purchase orders: %s',
+                              ', '.join(converted.mapped('display_name'))))
+
+        purchase_orders = rfqs._create_purchase_orders(rfq_lines_by_rfq)
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Purchase Order'),
+            'res_model': 'purchase.order',
+            'view_mode': 'tree,form',
+            'target': 'current',
+            'domain': [('id', 'in', purchase_orders.ids)],
+        }
+
+
+class PurchaseRequestQuoteCompare(models.TransientModel):
+    _name = 'purchase.request.quote.compare'
+    _description = 'Compare Vendor Quotes'
+
+    request_id = fields.Many2one('purchase.request.order', string='Purchase Request', required=True,
+                                 readonly=True, ondelete='cascade')
+    matrix_html = fields.Html('Quotes', compute='_compute_matrix_html', sanitize=False)
+    line_ids = fields.One2many('purchase.request.quote.compare.line', 'wizard_id', string='Selected Vendors')
+
+    @api.model
+    def default_get(self, fields_list):
+        res = super().default_get(fields_list)
+        if not res.get('request_id') and self.env.context.get('active_model') == 'purchase.request.order':
+            res['request_id'] = self.env.context.get('active_id')
+        if res.get('request_id') and 'line_ids' in fields_list:
+            matrix = self.env['purchase.request.order'].browse(res['request_id']).get_vendor_quote_matrix()
+            res['line_ids'] = [Command.create({
+                'request_line_id': line['id'],
+                'available_vendor_ids': [Command.set([quote['vendor_id'] for quote in line['quotes']])],
+                'vendor_id': line['best_vendor_id'],
+            }) for line in matrix['lines'] if line['quotes']]
+        return res
+
+    @api.depends('request_id')
+    def _compute_matrix_html(self):
+        for wizard in self:
+            if not wizard.request_id:
+                wizard.matrix_html = False
+                continue
+            matrix = wizard.request_id.get_vendor_quote_matrix()
+            wizard.matrix_html = self.env['ir.qweb']._render('%s.purchase_request_quote_matrix' % self._module, {
+                'currency': self.env['res.currency'].browse(matrix['currency_id']),
+                'vendors': matrix['vendors'],
+                'lines': [
+                    dict(line, quotes_by_vendor={quote['vendor_id']: quote for quote in line['quotes']})
+                    for line in matrix['lines']
+                ],
+            })
+
+    def action_create_purchase_orders(self):
+        self.ensure_one()
+        return self.request_id.action_create_po_from_best_quotes({
+            line.request_line_id.id: line.vendor_id.id for line in self.line_ids
+        })
+
+
+class PurchaseRequestQuoteCompareLine(models.TransientModel):
+    _name = 'purchase.request.quote.compare.line'
+    _description = 'Compare Vendor Quotes Line'
+
+    wizard_id = fields.Many2one('purchase.request.quote.compare', required=True, ondelete='cascade')
+    request_line_id = fields.Many2one('purchase.request.order.line', string='Request Line', required=True,
+                                      readonly=True, ondelete='cascade')
+    product_id = fields.Many2one(related='request_line_id.product_id')
+    quantity = fields.Float(related='request_line_id.quantity')
+    available_vendor_ids = fields.Many2many('res.partner', 'purchase_quote_compare_line_vendor_rel',
+                                            'line_id', 'partner_id', string='Quoting Vendors')
+    vendor_id = fields.Many2one('res.partner', string='Vendor', domain="[('id', 'in', available_vendor_ids)]")
@@ -0,0 +1,132 @@
+from collections import defaultdict
+
+from odoo import api, models, _
+from odoo.tools import float_round
+
+
+class PurchaseRequestOrder(models.Model):
+    _inherit = 'purchase.request.order'
+
+    @api.model
+    def _get_open_demand(self, company_ids):
+        """ Return the undelivered quantities of confirmed sale order lines, grouped by
+        company, product and unit of measure. """
+        self.env['sale.order'].flush_model(['state', 'company_id'])
+        self.env['sale.order.line'].flush_model(
+            ['order_id', 'product_id', 'product_uom', 'product_uom_qty', 'qty_delivered', 'display_type'])
+        self.env['product.product'].flush_model(['product_tmpl_id'])
+        self.env['product.template'].flush_model(['purchase_ok', 'type'])
+        # only the products that can be put on a request line: purchasable goods
+        self.env.cr.execute("""
+            SELECT so.company_id, sol.product_id, sol.product_uom, SUM(sol.product_uom_qty - sol.qty_delivered)
+              FROM sale_order_line sol
+              JOIN sale_order so ON so.id = sol.order_id
+              JOIN product_product pp ON pp.id = sol.product_id
+              JOIN product_template pt ON pt.id = pp.product_tmpl_id
+             WHERE so.state = 'sale'
+               AND so.company_id IN %s
+               AND sol.display_type IS NULL
+               AND sol.product_uom_qty > sol.qty_delivered
+               AND pt.purchase_ok
+               AND pt.type != 'service'
+          GROUP BY so.company_id, sol.product_id, sol.product_uom
+        """, [tuple(company_ids)])
+        return self.env.cr.fetchall()
+
+    @api.model
+    def _get_covered_demand(self, company_ids):
+        """ Return the quantities still on their way for the open demand, grouped by
+        company, product and unit of measure: the request lines not converted into a
+        purchase order yet, and the quantities not received yet on the purchase orders
+        created from requests. Received goods are not counted anymore, like the delivered
+        sale quantities are not counted in the demand. """
+        self.flush_model(['company_id'])
+        self.env['purchase.request.order.line'].flush_model(
+            ['order_id', 'product_id', 'product_uom', 'quantity', 'display_type'])
+        self.env['purchase.rfq'].flush_model(['state', 'purchase_order_id'])
+        self.env['purchase.rfq.line'].flush_model(['order_id', 'purchase_request_line_id'])
+        self.env['purchase.order'].flush_model(['state', 'company_id', 'request_order_id'])
+        self.env['purchase.order.line'].flush_model(
+            ['order_id', 'product_id', 'product_uom', 'product_qty', 'qty_received', 'display_type'])
+        self.env.cr.execute("""
+            SELECT o.company_id, l.product_id, l.product_uom, SUM(l.quantity)
+              FROM purchase_request_order_line l
+              JOIN purchase_request_order o ON o.id = l.order_id
+             WHERE o.company_id IN %(company_ids)s
+               AND l.display_type IS NULL
+               AND l.product_id IS NOT NULL
+               AND NOT EXISTS (
+                   SELECT 1
+                     FROM purchase_rfq_line rl
+                     JOIN purchase_rfq r ON r.id = rl.order_id
+                    WHERE rl.purchase_request_line_id = l.id
+                      AND (r.state = 'done' OR r.purchase_order_id IS NOT NULL))
+          GROUP BY o.company_id, l.product_id, l.product_uom
+         UNION ALL
+            SELECT po.company_id, pol.product_id, pol.product_uom, SUM(pol.product_qty - pol.qty_received)
+              FROM purchase_order_line pol
+              JOIN purchase_order po ON po.id = pol.order_id
+             WHERE po.request_order_id IS NOT NULL
+               AND po.state IN ('draft', 'sent', 'to approve', 'purchase')
+               AND po.company_id IN %(company_ids)s
+               AND pol.display_type IS NULL
+               AND pol.product_qty > pol.qty_received
+          GROUP BY po.company_id, pol.product_id, pol.product_uom
+        """, {'company_ids': tuple(company_ids)})
+        return self.env.cr.fetchall()
+
+    @api.model
+    def _generate_from_demand(self, companies=None):
+        """ Create one draft purchase request per company for the open sale demand that is
+        not covered yet by purchase requests. """
+        companies = companies or self.env.companies
+        demand = self._get_open_demand(companies.ids)
+        covered = self._get_covered_demand(companies.ids)
+
+        products = self.env['product.product'].browse({row[1] for row in demand})
+        uoms = self.env['uom.uom'].browse({row[2] for row in demand + covered})
+        purchase_uom = {product.id: product.uom_po_id for product in products}
+
+        # both sides are aggregated in the purchase unit of measure of the product
+        quantities = defaultdict(float)
+        for rows, sign in ((demand, 1), (covered, -1)):
+            for company_id, product_id, uom_id, quantity in rows:
+                if product_id not in purchase_uom:
+                    continue
+                quantity = uoms.browse(uom_id)._compute_quantity(quantity, purchase_uom[product_id], round=False)
+                quantities[company_id, product_id] += sign * quantity
+
+        lines_by_company = defaultdict(list)
+        for (company_id, product_id), quantity in sorted(quantities.items()):
+            uom = purchase_uom[product_id]
+            quantity = float_round(quantity, precision_rounding=uom.rounding, rounding_method='UP')
+            if quantity > 0:
+                lines_by_company[company_id].append((0, 0, {
+                    'product_id': product_id,
+                    'product_uom': uom.id,
+                    'quantity': quantity,
+                }))
+
+        return self.create([{
+            'partner_id': company.partner_id.id,
+            'company_id': company.id,
+            'currency_id': company.currency_id.id,
+            'origin': _('Replenishment'),
+            'order_line': lines_by_company[company.id],
+        } for company in companies if lines_by_company[company.id]])
+
+    @api.model
+    def action_generate_from_demand(self):
+        requests = self._generate_from_demand()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Generated Purchase Requests'),
+            'res_model': 'purchase.request.order',
+            'view_mode': 'tree,form',
+            'target': 'current',
+            'domain': [('id', 'in', requests.ids)],
+        }
+
+    @api.model
+    def _cron_generate_from_demand(self):
+        self._generate_from_demand(self.env['res.company'].search([]))
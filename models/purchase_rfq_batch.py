@@ -0,0 +1,138 @@
+import logging
+import multiprocessing
+import os
+import runpy
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from psycopg2 import errors
+
+from odoo import api, models
+from odoo.modules.registry import Registry
+from odoo.tools import config
+
+from .purchase_rfq_batch_bootstrap import BOOTSTRAP_RUN_NAME
+
+_logger = logging.getLogger(__name__)
+
+# First key of the (int, int) advisory locks taken on purchase.rfq ids
+RFQ_BATCH_LOCK_KEY = 7301
+
+
+# Run by the spawned worker processes before anything else is unpickled
+BATCH_WORKER_BOOTSTRAP = os.path.join(os.path.dirname(__file__), 'purchase_rfq_batch_bootstrap.py')
+
+
+def _get_batch_executor(workers):
+    """ Return a pool of ``workers`` spawned processes able to run this addon's code. """
+    # spawn rather than fork, forked children would share the parent's connections
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=runpy.run_path,
+        initargs=(BATCH_WORKER_BOOTSTRAP, {'options': dict(config.options)}, BOOTSTRAP_RUN_NAME),
+    )
+
+
+def _ping_batch_worker():
+    """ Return the pid of the worker and the addons path it runs with. """
+    return os.getpid(), config['addons_path']
+
+
+def _process_rfq_partition(dbname, uid, context, company_id, rfq_ids):
+    """ Convert the given confirmed RFQs of one company into purchase orders.
+
+    Runs in a worker process with its own registry and cursors. Each RFQ is handled in
+    its own transaction, guarded by a transaction-level advisory lock, so that a failure
+    only rolls back that RFQ and two workers never convert the same RFQ.
+    """
+    registry = Registry(dbname)
+    summary = {'company_id': company_id, 'done': 0, 'locked': 0, 'skipped': 0, 'failed': 0}
+    start = time.monotonic()
+    for rfq_id in rfq_ids:
+        with registry.cursor() as cr:
+            cr.execute("SELECT pg_try_advisory_xact_lock(%s, %s)", [RFQ_BATCH_LOCK_KEY, rfq_id])
+            if not cr.fetchone()[0]:
+                summary['locked'] += 1
+                continue
+            env = api.Environment(cr, uid, dict(context, allowed_company_ids=[company_id]))
+            rfq = env['purchase.rfq'].browse(rfq_id).exists()
+            # another run may have converted it between the partitioning and the lock
+            if not rfq or rfq.state != 'confirm' or rfq.purchase_order_id:
+                summary['skipped'] += 1
+                continue
+            try:
+                with cr.savepoint():
+                    rfq._create_purchase_order()
+                summary['done'] += 1
+            except errors.SerializationFailure:
+                summary['locked'] += 1
+            except Exception:
+                _logger.exception("Conversion of purchase.rfq(%s) into a purchase order failed", rfq_id)
+                summary['failed'] += 1
+    summary['duration'] = time.monotonic() - start
+    return summary
+
+
+class PurchaseRFQ(models.Model):
+    _inherit = 'purchase.rfq'
+
+    @api.model
+    def _get_pending_rfq_partitions(self):
+        """ Return the ids of the confirmed RFQs without purchase order, by company id. """
+        groups = self.sudo()._read_group(
+            [('state', '=', 'confirm'), ('purchase_order_id', '=', False)],
+            ['company_id'], ['id:array_agg'],
+        )
+        return {company.id: sorted(ids) for company, ids in groups}
+
+    @api.model
+    def _get_batch_workers(self, partition_count):
+        workers = int(self.env['ir.config_parameter'].sudo().get_param('purchase_request.rfq_batch_workers', 0))
+        return max(1, min(partition_count, workers or os.cpu_count() or 1))
+
+    @api.model
+    def _process_pending_rfqs(self, workers=None):
+        """ Convert all confirmed RFQs into purchase orders, one partition per company.
+
+        The partitions are processed in parallel by a pool of worker processes, each one
+        holding its own database cursors. Returns a summary of the run.
+
+        :param int workers: number of worker processes, by default the configured one;
+            with a single worker the partitions are processed in this process
+        """
+        partitions = self._get_pending_rfq_partitions()
+        start = time.monotonic()
+        summaries = []
+        if partitions:
+            dbname, uid, context = self.env.cr.dbname, self.env.uid, dict(self.env.context)
+            workers = workers or self._get_batch_workers(len(partitions))
+            if workers == 1:
+                summaries = [
+                    _process_rfq_partition(dbname, uid, context, company_id, rfq_ids)
+                    for company_id, rfq_ids in partitions.items()
+                ]
+            else:
+                with _get_batch_executor(workers) as executor:
+                    futures = [
+                        executor.submit(_process_rfq_partition, dbname, uid, context, company_id, rfq_ids)
+                        for company_id, rfq_ids in partitions.items()
+                    ]
+                    summaries = [future.result() for future in futures]
+        report = {
+            'companies': len(partitions),
+            'done': sum(summary['done'] for summary in summaries),
+            'locked': sum(summary['locked'] for summary in summaries),
+            'skipped': sum(summary['skipped'] for summary in summaries),
+            'failed': sum(summary['failed'] for summary in summaries),
+            'duration': time.monotonic() - start,
+            'partitions': summaries,
+        }
+        _logger.info(
+            "RFQ batch: %(done)s purchase orders created for %(companies)s companies in %(duration).2fs "
+            "(%(locked)s locked, %(skipped)s skipped, %(failed)s failed)", report)
+        return report
+
+    @api.model
+    def _cron_process_pending_rfqs(self):
+        self._process_pending_rfqs()
@@ -0,0 +1,25 @@
+""" Bootstrap of the worker processes spawned by the RFQ batch processing.
+
+A spawned child starts from a bare interpreter: ``odoo.addons.<module>`` cannot be
+imported until the server configuration and the addons path are set up. This file
+therefore only depends on the standard library and the Odoo core:
+:func:`~.purchase_rfq_batch._get_batch_executor` runs it by path in each worker with
+:func:`runpy.run_path`, ``options`` being the server configuration.
+"""
+import odoo.netsvc
+from odoo.modules.module import initialize_sys_path
+from odoo.tools import config
+
+BOOTSTRAP_RUN_NAME = '__purchase_rfq_batch_worker__'
+
+
+def bootstrap(options):
+    """ Set the server configuration up in a spawned worker, before anything of the
+    addon is unpickled. """
+    config.options.update(options)
+    odoo.netsvc.init_logger()
+    initialize_sys_path()
+
+
+if __name__ == BOOTSTRAP_RUN_NAME:
+    bootstrap(options)  # noqa: F821 (given by runpy.run_path)
@@ -0,0 +1,99 @@
+import math
+from collections import defaultdict
+
+from dateutil.relativedelta import relativedelta
+
+from odoo import api, fields, models, tools, _
+from odoo.exceptions import UserError
+from odoo.tools import float_compare
+
+# Longest lead time, in days, a vendor can submit through the portal
+PORTAL_BID_MAX_LEAD_TIME = 3650
+
+
+class PurchaseRFQ(models.Model):
+    _inherit = 'purchase.rfq'
+
+    def _compute_access_url(self):
+        super(PurchaseRFQ, self)._compute_access_url()
+        for rfq in self:
+            rfq.access_url = '/my/rfq/%s' % rfq.id
+
+    def _get_portal_bid_stamp(self):
+        """ Return a value that changes whenever the RFQ or one of its lines changes. """
+        self.ensure_one()
+        self.flush_recordset()
+        self.env['purchase.rfq.line'].flush_model()
+        self.env.cr.execute("""
+            SELECT r.write_date, COUNT(l.id), MAX(l.write_date)
+              FROM purchase_rfq r
+         LEFT JOIN purchase_rfq_line l ON l.order_id = r.id
+             WHERE r.id = %s
+          GROUP BY r.id
+        """, [self.id])
+        return self.env.cr.fetchone()
+
+    @api.model
+    @tools.ormcache('rfq_id', 'stamp', 'self.env.lang')
+    def _get_portal_bid_snapshot(self, rfq_id, stamp):
+        """ Return the values displayed on the portal bid page of the RFQ. """
+        rfq = self.sudo().browse(rfq_id)
+        lines = []
+        for line in rfq.order_line:
+            lines.append({
+                'id': line.id,
+                'display_type': line.display_type,
+                'product': line.product_id.display_name,
+                'name': line.name,
+                'quantity': line.quantity,
+                'uom': line.product_uom.name,
+                'price_unit': line.price_unit,
+                'lead_time': (line.date_planned - rfq.date_order).days if line.date_planned else '',
+                'price_subtotal': line.price_subtotal,
+            })
+        return {
+            'name': rfq.name,
+            'partner': rfq.partner_id.display_name,
+            'company': rfq.company_id.name,
+            'date_order': fields.Datetime.to_string(rfq.date_order),
+            'currency': rfq.currency_id.name,
+            'amount_untaxed': rfq.amount_untaxed,
+            'amount_total': rfq.amount_total,
+            'editable': rfq.state == 'draft',
+            'lines': lines,
+        }
+
+    def _apply_portal_bid(self, bids):
+        """ Apply the unit prices and lead times submitted by the vendor.
+
+        :param dict bids: ``{line_id: (price_unit, lead_time)}``, ``lead_time`` being a
+            number of days after the order deadline or ``None``
+        """
+        self.ensure_one()
+        if self.state != 'draft':
+            raise UserError(_('This request for quotation is not open for bids anymore.'))
+        for price_unit, lead_time in bids.values():
+            if not math.isfinite(price_unit) or price_unit < 0:
+                raise UserError(_('Prices must be positive numbers.'))
+            if lead_time is not None and not 0 <= lead_time <= PORTAL_BID_MAX_LEAD_TIME:
+                raise UserError(_('Lead times must be between 0 and %s days.', PORTAL_BID_MAX_LEAD_TIME))
+        precision = self.env['decimal.precision'].precision_get('Product Price')
+        lines_by_vals = defaultdict(lambda: self.env['purchase.rfq.line'])
+        for line in self.order_line.filtered(lambda l: l.id in bids and not l.display_type):
+            price_unit, lead_time = bids[line.id]
+            vals = {}
+            if float_compare(price_unit, line.price_unit, precision_digits=precision):
+                vals['price_unit'] = price_unit
+            if lead_time is not None:
+                date_planned = self.date_order + relativedelta(days=lead_time)
+                if date_planned != line.date_planned:
+                    vals['date_planned'] = date_planned
+            if vals:
+                lines_by_vals[tuple(sorted(vals.items()))] |= line
+        # one write per distinct set of values; the totals are recomputed once at flush
+        for vals, lines in lines_by_vals.items():
+            lines.write(dict(vals))
+        # posted as the vendor, not as the superuser the portal runs this with
+        self.message_post(body=_('Bid submitted through the portal for %s lines.',
+                                 sum(len(lines) for lines in lines_by_vals.values())),
+                          author_id=self.partner_id.id)
@@ -0,0 +1,224 @@
+from datetime import timedelta
+
+from odoo import api, fields, models, tools, _
+from odoo.exceptions import UserError
+
+SYNC_MODELS = ['purchase.request.order', 'purchase.request.order.line', 'purchase.rfq', 'purchase.rfq.line']
+
+# field types left out of the synchronized values
+SYNC_SKIPPED_FIELD_TYPES = ('one2many', 'many2many', 'html', 'binary')
+
+
+class BigInteger(fields.Integer):
+    """ Integer stored as a bigint column. """
+    column_type = ('int8', 'int8')
+
+
+class PurchaseSyncLog(models.Model):
+    _name = 'purchase.sync.log'
+    _description = 'Purchase Synchronization Change Log'
+    _order = 'id'
+    _log_access = False
+
+    res_model = fields.Char('Model', required=True, index=True)
+    res_id = fields.Integer('Record ID', required=True)
+    operation = fields.Selection([('create', 'Created'), ('write', 'Updated'), ('unlink', 'Deleted')],
+                                 required=True)
+    create_date = fields.Datetime('Logged On', default=fields.Datetime.now, index=True)
+    # id of the transaction that logged the change, set by the database. Ids are allocated
+    # before commit, in any order, so the feed is ordered by transaction instead and only
+    # returns the changes of transactions that are over for every running transaction.
+    txid = BigInteger('Transaction', readonly=True)
+
+    def init(self):
+        self.env.cr.execute("""
+            ALTER TABLE purchase_sync_log ALTER COLUMN txid SET DEFAULT txid_current();
+            UPDATE purchase_sync_log SET txid = 0 WHERE txid IS NULL;
+        """)
+        tools.create_index(self.env.cr, 'purchase_sync_log_txid_id_index', self._table, ['txid', 'id'])
+
+    @api.model
+    def _log_changes(self, records, operation):
+        if records:
+            self.sudo().create([
+                {'res_model': records._name, 'res_id': record_id, 'operation': operation}
+                for record_id in records.ids
+            ])
+
+    @api.model
+    def _get_sync_fields(self, model_name):
+        return [
+            fname for fname, field in self.env[model_name]._fields.items()
+            if field.store and field.type not in SYNC_SKIPPED_FIELD_TYPES
+        ]
+
+    @api.model
+    def _get_sync_xmin(self):
+        """ Return the oldest transaction still running: the changes logged by older
+        transactions are all committed or rolled back. """
+        self.env.cr.execute("SELECT txid_snapshot_xmin(txid_current_snapshot())")
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _parse_sync_cursor(self, cursor):
+        try:
+            return tuple(map(int, cursor.split('-'))) if cursor else (0, 0)
+        except (AttributeError, ValueError):
+            raise UserError(_('Invalid synchronization cursor: %s', cursor))
+
+    @api.model
+    def get_changes(self, cursor=0, limit=500, model_names=None):
+        """ Return the records created, updated or deleted since ``cursor``.
+
+        Each record appears once per page with its latest state: its stored fields except
+        html, binary and x2many ones (many2one as ids), or ``deleted`` when it is gone.
+        Pass the returned ``cursor`` back to get the next changes, a falsy cursor starts
+        from the beginning of the log. Changes of transactions that may still commit are
+        held back until no running transaction is older than them.
+
+        When changes after ``cursor`` were already removed from the log, the result has
+        ``resync_required`` set and no changes: the client has to read all the records
+        again, then continue from the returned ``cursor``.
+        """
+        last_txid, last_id = self._parse_sync_cursor(cursor)
+        horizon = self.env['ir.config_parameter'].sudo().get_param('purchase_request.sync_log_horizon')
+        if horizon and (last_txid, last_id) < self._parse_sync_cursor(horizon):
+            return {'cursor': horizon, 'has_more': False, 'changes': [], 'resync_required': True}
+        model_names = [name for name in (model_names or SYNC_MODELS) if name in SYNC_MODELS]
+        for model_name in model_names:
+            self.env[model_name].check_access_rights('read')
+        if not model_names:
+            return {'cursor': cursor, 'has_more': False, 'changes': [], 'resync_required': False}
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT txid, id, res_model, res_id, operation
+              FROM purchase_sync_log
+             WHERE (txid, id) > (%s, %s)
+               AND txid < %s
+               AND res_model IN %s
+          ORDER BY txid, id
+             LIMIT %s
+        """, [last_txid, last_id, self._get_sync_xmin(), tuple(model_names), limit + 1])
+        logs = self.env.cr.fetchall()
+        has_more = len(logs) > limit
+        logs = logs[:limit]
+
+        # the latest log of each record decides what is returned, in log order
+        latest = {}
+        for _txid, _log_id, res_model, res_id, operation in logs:
+            latest.pop((res_model, res_id), None)
+            latest[res_model, res_id] = operation
+
+        values = {}
+        for model_name in model_names:
+            ids = [res_id for (name, res_id), operation in latest.items()
+                   if name == model_name and operation != 'unlink']
+            records = self.env[model_name].with_context(active_test=False).browse(ids).exists()
+            records = records._filter_access_rules('read')
+            for vals in records.read(self._get_sync_fields(model_name), load=None):
+                values[model_name, vals['id']] = vals
+
+        changes = []
+        for (model_name, res_id), operation in latest.items():
+            if operation == 'unlink' or (model_name, res_id) in values:
+                changes.append({
+                    'model': model_name,
+                    'id': res_id,
+                    'deleted': operation == 'unlink',
+                    'values': values.get((model_name, res_id), {}),
+                })
+            elif not self.env[model_name].browse(res_id).exists():
+                changes.append({'model': model_name, 'id': res_id, 'deleted': True, 'values': {}})
+        return {
+            'cursor': '%s-%s' % logs[-1][:2] if logs else cursor,
+            'has_more': has_more,
+            'changes': changes,
+            'resync_required': False,
+        }
+
+    @api.autovacuum
+    def _gc_sync_log(self):
+        """ Remove the old logs, and remember the last removed position: the clients behind
+        it have missed changes and must resynchronize. """
+        ICP = self.env['ir.config_parameter'].sudo()
+        days = int(ICP.get_param('purchase_request.sync_log_days', 90))
+        self.flush_model()
+        self.env.cr.execute("""
+            DELETE FROM purchase_sync_log WHERE create_date < %s RETURNING txid, id
+        """, [fields.Datetime.now() - timedelta(days=days)])
+        removed = self.env.cr.fetchall()
+        if removed:
+            horizon = max(removed)
+            previous = ICP.get_param('purchase_request.sync_log_horizon')
+            if not previous or horizon > self._parse_sync_cursor(previous):
+                ICP.set_param('purchase_request.sync_log_horizon', '%s-%s' % horizon)
+            self.invalidate_model()
+
+
+class PurchaseSyncMixin(models.AbstractModel):
+    _name = 'purchase.sync.mixin'
+    _description = 'Purchase Synchronization Change Log Mixin'
+    _sync_log = True
+    # many2one to the record whose stored computed fields (totals, dates) depend on
+    # these records: the recomputation does not go through its write()
+    _sync_parent = None
+
+    def _get_sync_parents(self):
+        return self[self._sync_parent] if self._sync_parent else None
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super(PurchaseSyncMixin, self).create(vals_list)
+        log = self.env['purchase.sync.log']
+        log._log_changes(records, 'create')
+        log._log_changes(records._get_sync_parents(), 'write')
+        return records
+
+    def write(self, vals):
+        parents = self._get_sync_parents()
+        res = super(PurchaseSyncMixin, self).write(vals)
+        log = self.env['purchase.sync.log']
+        log._log_changes(self, 'write')
+        if self._sync_parent in vals:
+            parents |= self._get_sync_parents()
+        log._log_changes(parents, 'write')
+        return res
+
+    def unlink(self):
+        # lines deleted in cascade by the database never go through their own unlink
+        children = [
+            self[field.name] for field in self._fields.values()
+            if field.type == 'one2many' and getattr(self.env[field.comodel_name], '_sync_log', False)
+        ]
+        parents = self._get_sync_parents()
+        # logged once the deletion went through, a refused deletion logs nothing
+        res = super(PurchaseSyncMixin, self).unlink()
+        log = self.env['purchase.sync.log']
+        for lines in children:
+            log._log_changes(lines, 'unlink')
+        log._log_changes(self, 'unlink')
+        if parents is not None:
+            log._log_changes(parents.exists(), 'write')
+        return res
+
+
+class PurchaseRequestOrder(models.Model):
+    _name = 'purchase.request.order'
+    _inherit = ['purchase.request.order', 'purchase.sync.mixin']
+
+
+class PurchaseRequestOrderLine(models.Model):
+    _name = 'purchase.request.order.line'
+    _inherit = ['purchase.request.order.line', 'purchase.sync.mixin']
+    _sync_parent = 'order_id'
+
+
+class PurchaseRFQ(models.Model):
+    _name = 'purchase.rfq'
+    _inherit = ['purchase.rfq', 'purchase.sync.mixin']
+
+
+class PurchaseRFQLine(models.Model):
+    _name = 'purchase.rfq.line'
+    _inherit = ['purchase.rfq.line', 'purchase.sync.mixin']
+    _sync_parent = 'order_id'
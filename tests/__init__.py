@@ -0,0 +1,7 @@
+from . import test_purchase_rfq_batch
+from . import test_purchase_request_quote
+from . import test_portal_bid
+from . import test_purchase_request_replenishment
+from . import test_purchase_request_copy
+from . import test_purchase_sync
+from . import test_purchase_request_precompute
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from odoo import http
+from odoo.tests import HttpCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestPortalBid(HttpCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.vendor = cls.env['res.partner'].create({'name': 'Portal Vendor'})
+        cls.product = cls.env['product.product'].create({'name': 'Portal Product', 'purchase_ok': True})
+        cls.rfq = cls.env['purchase.rfq'].create({
+            'partner_id': cls.vendor.id,
+            'order_line': [(0, 0, {'product_id': cls.product.id, 'quantity': 5, 'price_unit': 10})],
+        })
+        cls.rfq._portal_ensure_token()
+        cls.line = cls.rfq.order_line
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate(None, None)
+
+    def _post_bid(self, values, access_token=None):
+        return self.url_open('/my/rfq/%s/bid' % self.rfq.id, data=dict({
+            'csrf_token': http.Request.csrf_token(self),
+            'access_token': access_token or self.rfq.access_token,
+        }, **values), allow_redirects=False)
+
+    def test_get(self):
+        response = self.url_open(self.rfq.get_portal_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(self.rfq.name, response.text)
+
+    def test_post_bid(self):
+        response = self._post_bid({'price_%s' % self.line.id: '12.5', 'lead_time_%s' % self.line.id: '7'})
+        self.assertEqual(response.status_code, 303)
+        self.assertIn('submitted=1', response.headers['Location'])
+        self.line.invalidate_recordset()
+        self.assertEqual(self.line.price_unit, 12.5)
+        self.assertEqual(self.line.date_planned, self.rfq.date_order + timedelta(days=7))
+        self.assertEqual(self.rfq.message_ids[0].author_id, self.vendor)
+
+    def test_post_bid_not_draft(self):
+        self.rfq.action_confirm()
+        response = self._post_bid({'price_%s' % self.line.id: '12.5'})
+        self.assertEqual(response.status_code, 303)
+        self.assertIn('error=closed', response.headers['Location'])
+        self.line.invalidate_recordset()
+        self.assertEqual(self.line.price_unit, 10)
+
+    def test_error_codes(self):
+        response = self.url_open(self.rfq.get_portal_url(query_string='&error=closed'))
+        self.assertIn('not open for bids anymore', response.text)
+        response = self.url_open(self.rfq.get_portal_url(query_string='&error=Call+us+at+555'))
+        self.assertNotIn('Call us at 555', response.text)
+
+    def test_post_bid_bad_token(self):
+        response = self._post_bid({'price_%s' % self.line.id: '12.5'}, access_token='wrong-token')
+        self.assertEqual(response.status_code, 303)
+        self.assertTrue(response.headers['Location'].endswith('/my'))
+        self.line.invalidate_recordset()
+        self.assertEqual(self.line.price_unit, 10)
+
+    def test_post_bid_invalid_values(self):
+        for price_unit, lead_time in (('nan', ''), ('inf', ''), ('12', '99999999999')):
+            response = self._post_bid({'price_%s' % self.line.id: price_unit, 'lead_time_%s' % self.line.id: lead_time})
+            self.assertEqual(response.status_code, 303)
+            self.assertIn('error=values', response.headers['Location'])
+        self.line.invalidate_recordset()
+        self.assertEqual(self.line.price_unit, 10)
@@ -0,0 +1,59 @@
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestPurchaseRequestCopy(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # the references come from sequences that the module does not ship
+        cls.env['ir.sequence'].create([
+            {'name': 'Copy Requests', 'code': 'purchase.request.order', 'prefix': 'PRC'},
+            {'name': 'Copy RFQs', 'code': 'purchase.rfq', 'prefix': 'RFQC'},
+        ])
+        cls.customer = cls.env['res.partner'].create({'name': 'Copy Customer'})
+        cls.product = cls.env['product.product'].create({
+            'name': 'Copy Product', 'purchase_ok': True, 'standard_price': 8,
+        })
+        cls.request = cls.env['purchase.request.order'].create({
+            'partner_id': cls.customer.id,
+            'order_line': [
+                (0, 0, {'product_id': cls.product.id, 'quantity': 3, 'price_unit': 10}),
+                (0, 0, {'product_id': cls.product.id, 'quantity': 2, 'price_unit': 20}),
+            ],
+        })
+        cls.request.action_confirm()
+
+    def test_copy_request(self):
+        copy = self.request.copy()
+        self.assertEqual(copy.state, 'draft')
+        self.assertNotEqual(copy.name, self.request.name)
+        self.assertTrue(copy.name.startswith('PRC'))
+        self.assertEqual(copy.order_line.mapped('price_unit'), [10, 20])
+        self.assertEqual(copy.order_line.mapped('price_subtotal'), [30, 40])
+        self.assertEqual(copy.amount_untaxed, 70)
+        self.assertEqual(copy.amount_total, self.request.amount_total)
+
+    def test_copy_line_with_quantity(self):
+        line = self.request.order_line[0]
+        copy = line.copy({'quantity': 5})
+        # the price depends on the quantity: it is recomputed, and so are the amounts
+        self.assertEqual(copy.price_unit, 8)
+        self.assertEqual(copy.price_subtotal, 40)
+        self.assertEqual(copy.price_total, copy.price_subtotal + copy.price_tax)
+        self.assertEqual(self.request.amount_untaxed, 110)
+
+    def test_copy_rfq(self):
+        rfq = self.env['purchase.rfq'].create({
+            'partner_id': self.customer.id,
+            'order_line': [(0, 0, {'product_id': self.product.id, 'quantity': 3, 'price_unit': 10})],
+        })
+        rfq.action_confirm()
+        rfq._create_purchase_order()
+        copy = rfq.copy()
+        self.assertEqual(copy.state, 'draft')
+        self.assertFalse(copy.purchase_order_id)
+        self.assertNotEqual(copy.name, rfq.name)
+        self.assertEqual(copy.order_line.price_subtotal, 30)
+        self.assertEqual(copy.amount_untaxed, 30)
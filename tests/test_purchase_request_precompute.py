@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from odoo.sql_db import Cursor
+from odoo.tests import TransactionCase, tagged
+
+PRECOMPUTED_COLUMNS = [
+    'name', 'product_uom', 'price_unit', 'date_planned', 'product_packaging_id', 'product_packaging_qty',
+    'price_subtotal', 'price_tax', 'price_total',
+]
+
+
+@tagged('post_install', '-at_install')
+class TestPurchaseRequestPrecompute(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Precompute Partner'})
+        cls.uom_dozen = cls.env.ref('uom.product_uom_dozen')
+        cls.product = cls.env['product.product'].create({
+            'name': 'Precompute Product',
+            'purchase_ok': True,
+            'seller_ids': [(0, 0, {'partner_id': cls.partner.id, 'price': 7, 'delay': 3})],
+            'packaging_ids': [(0, 0, {'name': 'Box of 2', 'qty': 2, 'purchase': True})],
+        })
+
+    @contextmanager
+    def _capture_queries(self):
+        queries = []
+        execute = Cursor.execute
+
+        def logged_execute(cr, query, params=None, log_exceptions=True):
+            queries.append(str(getattr(query, 'code', query)))
+            return execute(cr, query, params, log_exceptions)
+
+        with patch.object(Cursor, 'execute', logged_execute):
+            yield queries
+            self.env.flush_all()
+
+    def test_rfq_lines_inserted_with_final_values(self):
+        self.env.flush_all()
+        with self._capture_queries() as queries:
+            rfq = self.env['purchase.rfq'].create({
+                'partner_id': self.partner.id,
+                'order_line': [(0, 0, {'product_id': self.product.id, 'quantity': 4}) for _i in range(3)],
+            })
+        line_queries = [query for query in queries if 'purchase_rfq_line' in query.split('SET')[0]]
+        self.assertEqual(len([query for query in line_queries if query.startswith('INSERT')]), 1,
+                         "the lines are inserted in a single statement")
+        updates = [query for query in line_queries if query.startswith('UPDATE')]
+        for column in PRECOMPUTED_COLUMNS:
+            self.assertFalse([query for query in updates if '"%s"' % column in query],
+                             "%s is inserted with its final value" % column)
+
+        rfq.invalidate_recordset()
+        for line in rfq.order_line:
+            self.assertEqual(line.name, self.product.name)
+            self.assertEqual(line.product_uom, self.product.uom_po_id)
+            self.assertEqual(line.price_unit, 7)
+            self.assertEqual((line.date_planned - rfq.date_order).days, 3)
+            self.assertEqual(line.product_packaging_id, self.product.packaging_ids)
+            self.assertEqual(line.product_packaging_qty, 2)
+            self.assertEqual(line.price_subtotal, 28)
+
+    def test_request_line_explicit_values(self):
+        request = self.env['purchase.request.order'].create({
+            'partner_id': self.partner.id,
+            'order_line': [(0, 0, {
+                'product_id': self.product.id,
+                'quantity': 1,
+                'product_uom': self.uom_dozen.id,
+                'price_unit': 99,
+            })],
+        })
+        request.invalidate_recordset()
+        self.assertEqual(request.order_line.product_uom, self.uom_dozen)
+        self.assertEqual(request.order_line.price_unit, 99)
+        self.assertEqual(request.order_line.price_subtotal, 99)
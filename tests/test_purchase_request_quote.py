@@ -0,0 +1,70 @@
+from odoo.exceptions import UserError
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestPurchaseRequestQuote(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.customer = cls.env['res.partner'].create({'name': 'Quote Customer'})
+        cls.vendor_a = cls.env['res.partner'].create({'name': 'Quote Vendor A'})
+        cls.vendor_b = cls.env['res.partner'].create({'name': 'Quote Vendor B'})
+        cls.product = cls.env['product.product'].create({'name': 'Quote Product', 'purchase_ok': True})
+        cls.uom_dozen = cls.env.ref('uom.product_uom_dozen')
+        cls.request = cls.env['purchase.request.order'].create({
+            'partner_id': cls.customer.id,
+            'order_line': [(0, 0, {'product_id': cls.product.id, 'quantity': 12, 'price_unit': 1})],
+        })
+        cls.request_line = cls.request.order_line
+
+    def _create_rfq(self, vendor, price_unit, **line_vals):
+        return self.env['purchase.rfq'].create({
+            'partner_id': vendor.id,
+            'request_id': self.request.id,
+            'order_line': [(0, 0, dict({
+                'product_id': self.product.id,
+                'quantity': 12,
+                'price_unit': price_unit,
+                'purchase_request_line_id': self.request_line.id,
+            }, **line_vals))],
+        })
+
+    def test_best_quote_is_normalized(self):
+        # 100 per dozen is cheaper than 10 per unit
+        self._create_rfq(self.vendor_a, 10)
+        self._create_rfq(self.vendor_b, 100, product_uom=self.uom_dozen.id, quantity=1)
+        line = self.request.get_vendor_quote_matrix()['lines'][0]
+        self.assertEqual(line['best_vendor_id'], self.vendor_b.id)
+
+    def test_create_po_from_best_quotes(self):
+        rfq_a = self._create_rfq(self.vendor_a, 10)
+        rfq_b = self._create_rfq(self.vendor_b, 12)
+
+        self.request.action_create_po_from_best_quotes()
+        self.assertEqual(rfq_a.state, 'done')
+        self.assertEqual(rfq_a.purchase_order_id.partner_id, self.vendor_a)
+        self.assertEqual(rfq_a.purchase_order_id.request_id, rfq_a)
+        self.assertFalse(rfq_b.purchase_order_id)
+
+        # the converted RFQ does not quote anymore, the other vendor is the best one left
+        line = self.request.get_vendor_quote_matrix()['lines'][0]
+        self.assertEqual([quote['rfq_id'] for quote in line['quotes']], [rfq_b.id])
+
+        rfq_b.write({'state': 'done'})
+        with self.assertRaises(UserError):
+            self.request.action_create_po_from_best_quotes()
+
+    def test_compare_wizard(self):
+        self._create_rfq(self.vendor_a, 10)
+        rfq_b = self._create_rfq(self.vendor_b, 12)
+        wizard = self.env['purchase.request.quote.compare'].with_context(
+            active_model='purchase.request.order', active_id=self.request.id,
+        ).create({})
+        self.assertEqual(wizard.line_ids.vendor_id, self.vendor_a)
+        self.assertIn(self.vendor_b.name, wizard.matrix_html)
+
+        wizard.line_ids.vendor_id = self.vendor_b
+        wizard.action_create_purchase_orders()
+        self.assertEqual(rfq_b.state, 'done')
@@ -0,0 +1,72 @@
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestPurchaseRequestReplenishment(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.customer = cls.env['res.partner'].create({'name': 'Replenishment Customer'})
+        cls.vendor = cls.env['res.partner'].create({'name': 'Replenishment Vendor'})
+        cls.product = cls.env['product.product'].create({
+            'name': 'Replenishment Product', 'type': 'consu', 'purchase_ok': True, 'sale_ok': True,
+        })
+        cls.service = cls.env['product.product'].create({
+            'name': 'Replenishment Service', 'type': 'service', 'purchase_ok': True, 'sale_ok': True,
+        })
+
+    def _sell(self, quantity):
+        order = self.env['sale.order'].create({
+            'partner_id': self.customer.id,
+            'order_line': [
+                (0, 0, {'product_id': self.product.id, 'product_uom_qty': quantity}),
+                (0, 0, {'product_id': self.service.id, 'product_uom_qty': quantity}),
+            ],
+        })
+        order.action_confirm()
+        return order
+
+    def _generate(self):
+        requests = self.env['purchase.request.order']._generate_from_demand(self.env.company)
+        lines = requests.order_line.filtered(lambda l: l.product_id in self.product | self.service)
+        self.assertNotIn(self.service, lines.product_id)
+        return lines
+
+    def _purchase(self, request_line):
+        rfq = self.env['purchase.rfq'].create({
+            'partner_id': self.vendor.id,
+            'request_id': request_line.order_id.id,
+            'order_line': [(0, 0, {
+                'product_id': self.product.id,
+                'quantity': request_line.quantity,
+                'price_unit': 5,
+                'purchase_request_line_id': request_line.id,
+            })],
+        })
+        rfq.action_confirm()
+        return rfq._create_purchase_order()
+
+    def test_two_replenishment_cycles(self):
+        # first cycle: the demand is requested, then purchased
+        sale_order = self._sell(10)
+        request_line = self._generate()
+        self.assertEqual(request_line.quantity, 10)
+        self.assertFalse(self._generate(), "the open request covers the demand")
+
+        purchase_order = self._purchase(request_line)
+        self.assertFalse(self._generate(), "the incoming purchase order covers the demand")
+
+        # the goods are received and delivered: nothing is pending on either side
+        self.env.flush_all()
+        self.env.cr.execute("UPDATE sale_order_line SET qty_delivered = product_uom_qty WHERE order_id = %s",
+                            [sale_order.id])
+        self.env.cr.execute("UPDATE purchase_order_line SET qty_received = product_qty WHERE order_id = %s",
+                            [purchase_order.id])
+        self.env.invalidate_all()
+        self.assertFalse(self._generate())
+
+        # second cycle: the first request does not net out the new demand
+        self._sell(10)
+        request_line = self._generate()
+        self.assertEqual(request_line.quantity, 10)
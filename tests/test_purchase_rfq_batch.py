@@ -0,0 +1,60 @@
+import os
+
+from odoo.tests import TransactionCase, tagged
+from odoo.tools import config
+
+from ..models.purchase_rfq_batch import _get_batch_executor, _ping_batch_worker, _process_rfq_partition
+
+
+@tagged('post_install', '-at_install')
+class TestPurchaseRFQBatch(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.vendor = cls.env['res.partner'].create({'name': 'Batch Vendor'})
+        cls.product = cls.env['product.product'].create({'name': 'Batch Product', 'purchase_ok': True})
+
+    def _create_rfq(self):
+        return self.env['purchase.rfq'].create({
+            'partner_id': self.vendor.id,
+            'order_line': [(0, 0, {'product_id': self.product.id, 'quantity': 5, 'price_unit': 10})],
+        })
+
+    def test_process_pending_rfqs(self):
+        # the partitions open their own cursors, in test mode they share the test one
+        # and see the RFQs created by the test
+        self.registry.enter_test_mode(self.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+        rfq = self._create_rfq()
+        draft_rfq = self._create_rfq()
+        rfq.action_confirm()
+        self.env.flush_all()
+
+        report = self.env['purchase.rfq']._process_pending_rfqs(workers=1)
+        self.env.invalidate_all()
+        self.assertEqual(report['done'], 1)
+        self.assertEqual(rfq.state, 'done')
+        self.assertEqual(rfq.purchase_order_id.order_line.price_unit, 10)
+        self.assertFalse(draft_rfq.purchase_order_id)
+
+        # converted RFQs are not pending anymore
+        report = self.env['purchase.rfq']._process_pending_rfqs(workers=1)
+        self.assertEqual(report['done'], 0)
+
+    def test_spawned_workers(self):
+        """ The spawned workers can import and run this addon's code. """
+        with _get_batch_executor(2) as executor:
+            results = [executor.submit(_ping_batch_worker).result() for _i in range(4)]
+            self.assertTrue(all(pid != os.getpid() for pid, _addons_path in results))
+            self.assertEqual({addons_path for _pid, addons_path in results}, {config['addons_path']})
+
+            # the workers only see committed data: an unknown RFQ goes through the whole
+            # lock and check sequence of a real partition and is skipped
+            self.env.cr.execute("SELECT COALESCE(MAX(id), 0) + 1000 FROM purchase_rfq")
+            missing_id = self.env.cr.fetchone()[0]
+            summary = executor.submit(
+                _process_rfq_partition, self.env.cr.dbname, self.env.uid, {}, self.env.company.id, [missing_id],
+            ).result()
+        self.assertEqual(summary['skipped'], 1)
+        self.assertEqual(summary['failed'], 0)
@@ -0,0 +1,98 @@
+from odoo.exceptions import UserError
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestPurchaseSync(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.customer = cls.env['res.partner'].create({'name': 'Sync Customer'})
+        cls.product = cls.env['product.product'].create({'name': 'Sync Product', 'purchase_ok': True})
+        cls.Log = cls.env['purchase.sync.log']
+
+    def setUp(self):
+        super().setUp()
+        # the feed only returns the changes of finished transactions, the test one included
+        self.patch(type(self.Log), '_get_sync_xmin', lambda self: 2 ** 62)
+        self.cursor = self._drain(0)[0]
+
+    def _drain(self, cursor, limit=500):
+        """ Return the final cursor and the changes after ``cursor``, page by page. """
+        pages = []
+        while True:
+            result = self.Log.get_changes(cursor, limit=limit)
+            self.assertFalse(result['resync_required'])
+            pages.append(result['changes'])
+            cursor = result['cursor']
+            if not result['has_more']:
+                return cursor, pages
+
+    def _changes(self, pages):
+        return {(change['model'], change['id']): change for page in pages for change in page}
+
+    def _create_request(self):
+        return self.env['purchase.request.order'].create({
+            'partner_id': self.customer.id,
+            'order_line': [
+                (0, 0, {'product_id': self.product.id, 'quantity': 1, 'price_unit': 10}),
+                (0, 0, {'product_id': self.product.id, 'quantity': 2, 'price_unit': 10}),
+            ],
+        })
+
+    def test_create_write_paging(self):
+        request = self._create_request()
+        line_1, line_2 = request.order_line
+        cursor, pages = self._drain(self.cursor, limit=1)
+        self.assertGreater(len(pages), 1)
+        changes = self._changes(pages)
+        self.assertEqual(set(changes), {
+            ('purchase.request.order', request.id),
+            ('purchase.request.order.line', line_1.id),
+            ('purchase.request.order.line', line_2.id),
+        })
+        self.assertEqual(changes['purchase.request.order.line', line_2.id]['values']['quantity'], 2)
+
+        # the cursor continues after what was already returned; a line write logs its order
+        line_1.quantity = 4
+        cursor, pages = self._drain(cursor)
+        changes = self._changes(pages)
+        self.assertEqual(set(changes), {
+            ('purchase.request.order', request.id),
+            ('purchase.request.order.line', line_1.id),
+        })
+        self.assertEqual(changes['purchase.request.order.line', line_1.id]['values']['quantity'], 4)
+        self.assertEqual(self._drain(cursor), (cursor, [[]]))
+
+    def test_unlink_cascade(self):
+        request = self._create_request()
+        lines = request.order_line
+        cursor = self._drain(self.cursor)[0]
+        request.unlink()
+        changes = self._changes(self._drain(cursor)[1])
+        self.assertEqual(set(changes), {('purchase.request.order', request.id)} | {
+            ('purchase.request.order.line', line_id) for line_id in lines.ids})
+        self.assertTrue(all(change['deleted'] for change in changes.values()))
+
+    def test_unlink_refused(self):
+        request = self._create_request()
+        request.action_confirm()
+        cursor = self._drain(self.cursor)[0]
+        with self.assertRaises(UserError):
+            request.unlink()
+        self.assertFalse(self.Log.search_count([('operation', '=', 'unlink'), ('res_id', '=', request.id),
+                                                ('res_model', '=', 'purchase.request.order')]))
+        self.assertEqual(self._drain(cursor), (cursor, [[]]))
+
+    def test_resync_required(self):
+        self._create_request()
+        self.env['ir.config_parameter'].set_param('purchase_request.sync_log_days', -1)
+        self.Log._gc_sync_log()
+        result = self.Log.get_changes(self.cursor)
+        self.assertTrue(result['resync_required'])
+        self.assertFalse(result['changes'])
+
+        # the client continues from the returned cursor once resynchronized
+        result = self.Log.get_changes(result['cursor'])
+        self.assertFalse(result['resync_required'])